@@ -2,6 +2,7 @@
 CLI entry point for ChatGPT Conversation Extractor.
 """
 
+import os
 import sys
 import argparse
 from pathlib import Path
@@ -73,8 +74,8 @@ def validate_cli_arguments(args: argparse.Namespace) -> None:
         sys.exit(1)
 
 
-def main() -> None:
-    """Main entry point with argument parsing."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser (separate so tests can introspect it)."""
     parser = argparse.ArgumentParser(
         description="Extract ChatGPT conversations to markdown and/or JSON files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -150,6 +151,23 @@ Migration note for v3.1:
         help="Sync file timestamps with conversation metadata (default: true)",
     )
 
+    # Parallel processing
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for conversation processing "
+        "(default: 1 = serial; 0 = one per CPU core)",
+    )
+
+    # Aggregated markdown output
+    parser.add_argument(
+        "--aggregate",
+        action="store_true",
+        help="Concatenate all markdown conversations per project into one file "
+        "with delimiter anchors (skips per-file timestamp sync)",
+    )
+
     # Existing options
     parser.add_argument(
         "--analyze-failures",
@@ -163,7 +181,12 @@ Migration note for v3.1:
         "--version", action="version", version="ChatGPT Conversation Extractor v3.1"
     )
 
-    args = parser.parse_args()
+    return parser
+
+
+def main() -> None:
+    """Main entry point with argument parsing."""
+    args = build_parser().parse_args()
 
     # Initialize logging before any operations for complete diagnostic coverage
     logger = configure_production_logging(debug=args.debug)
@@ -173,14 +196,14 @@ Migration note for v3.1:
 
     try:
         logger.info("Starting ChatGPT Conversation Extractor v3.1")
-        logger.info(f"Output format: {args.output_format}")
+        logger.info("Output format: %s", args.output_format)
         if args.output_format in ["json", "both"]:
-            logger.info(f"JSON format: {args.json_format}")
+            logger.info("JSON format: %s", args.json_format)
 
         # Verify input accessibility early to fail fast with clear error message
         input_path = Path(args.input_file)
         if not input_path.exists():
-            logger.critical(f"Input file '{args.input_file}' not found")
+            logger.critical("Input file '%s' not found", args.input_file)
             sys.exit(1)
 
         # Execute extraction with format-aware configuration and timestamp preservation
@@ -193,6 +216,8 @@ Migration note for v3.1:
             json_dir=args.json_dir,
             json_file=args.json_file,
             preserve_timestamps=args.preserve_timestamps,
+            workers=args.workers if args.workers > 0 else os.cpu_count() or 1,
+            aggregate_markdown=args.aggregate,
         )
         extractor.extract_all()
 
@@ -3,11 +3,14 @@ Main extractor class for ChatGPT conversation processing.
 """
 
 import json
+import mmap
 import os
-import re
 import sys
 import time
 import traceback
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple, Set, Union
@@ -15,14 +18,115 @@ from collections import defaultdict
 
 import yaml
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+if sys.platform == "win32":
+    # Imported once here instead of per saved file inside the creation-time
+    # setter; pywin32 is optional, so degrade to mtime-only sync without it
+    try:
+        import pywintypes
+        import win32con
+        import win32file
+
+        PYWIN32_AVAILABLE = True
+    except ImportError:
+        PYWIN32_AVAILABLE = False
+else:
+    PYWIN32_AVAILABLE = False
+
+# Exports below this size parse faster with a bulk loads; above it the
+# incremental parser wins by never buffering the raw bytes
+STREAM_THRESHOLD_BYTES = 100 * 1024 * 1024
+
 from .processors import MessageProcessor
-from .trackers import SchemaEvolutionTracker, ProgressTracker
+from .trackers import (
+    SchemaEvolutionTracker,
+    ProgressTracker,
+    acquire_scratch_set,
+    release_scratch_set,
+)
 from .logging_config import get_logger, log_exception
 
 # Constants for JSON output formatting
 JSON_EXPORT_FILENAME_PATTERN = "conversations_export_{timestamp}.json"
 TIMESTAMP_FORMAT_ISO8601 = "%Y-%m-%dT%H:%M:%S.%fZ"
 
+# Filename sanitization table: Windows/Unix forbidden characters become '_',
+# ASCII control characters (0-31) are dropped; one str.translate pass covers
+# both instead of a regex substitution plus a per-character filter
+_FILENAME_TRANSLATE = str.maketrans(
+    {**{c: "_" for c in '<>:"/\\|?*'}, **{c: None for c in range(32)}}
+)
+
+# Prebuilt markdown headings for the common roles; anything else falls
+# back to title-casing the role name
+_ROLE_HEADINGS = {"system": "## System", "user": "## User", "assistant": "## Assistant"}
+
+# Bound once; skips the class attribute lookup on every timestamp conversion
+_fromtimestamp = datetime.fromtimestamp
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Serialize JSON output with the fastest available encoder.
+
+    orjson emits the full indented document as one bytes object written in
+    a single call; the stdlib fallback matches its UTF-8/indent output.
+    """
+    if ORJSON_AVAILABLE:
+        path.write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        )
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_timestamp(timestamp_str: str) -> Optional[float]:
+    """Pure timestamp-parsing kernel; cached because create/update stamps
+    repeat across conversations exported in the same batch."""
+    # Handle ChatGPT's specific ISO format with Z suffix
+    if timestamp_str.endswith("Z"):
+        timestamp_str = timestamp_str[:-1] + "+00:00"
+
+    try:
+        timestamp = datetime.fromisoformat(timestamp_str).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+    # Pre-1970 (negative) timestamps cause errors on Windows and older
+    # Unix systems
+    return timestamp if timestamp >= 0 else None
+
+
+@lru_cache(maxsize=1024)
+def _sanitize_title(title: str, max_length: int) -> str:
+    """Pure sanitization kernel; cached because titles repeat heavily
+    across exports ("New chat", project template names)."""
+    # Forbidden characters and control characters in one C-level pass
+    safe_title = title.translate(_FILENAME_TRANSLATE)
+
+    if len(safe_title) > max_length:
+        safe_title = safe_title[:max_length].rstrip()
+
+    # Windows silently strips trailing dots/spaces, causing mismatches
+    safe_title = safe_title.rstrip(". ")
+
+    return safe_title or "untitled"
+
 
 class ConversationExtractorV2:
     """Enhanced ChatGPT conversation extractor with multi-format output support.
@@ -43,6 +147,8 @@ class ConversationExtractorV2:
         json_dir: Optional[str] = None,
         json_file: Optional[str] = None,
         preserve_timestamps: bool = True,
+        workers: int = 1,
+        aggregate_markdown: bool = False,
     ):
         """Initialize the extractor with multi-format configuration.
 
@@ -56,6 +162,12 @@ class ConversationExtractorV2:
             json_file: Override path for single JSON output file
             preserve_timestamps: Sync file timestamps with conversation metadata
                                  (individual files only; single JSON uses processing time)
+            workers: Process conversations in parallel with this many worker
+                     processes (1 = serial; file writing stays in the main process)
+            aggregate_markdown: Concatenate all markdown output per project into
+                                one file instead of writing one file per
+                                conversation (opt-in; avoids per-file open/close
+                                overhead on large exports)
         """
         self.logger = get_logger(__name__)
         self.input_file = Path(input_file)
@@ -65,6 +177,31 @@ class ConversationExtractorV2:
         self.output_format = output_format
         self.json_format = json_format
         self.preserve_timestamps = preserve_timestamps
+        self.workers = max(1, workers)
+        self.aggregate_markdown = aggregate_markdown
+
+        # Open aggregated-file handles keyed by project_id (or "conversations"
+        # for non-project output); closed by _close_aggregate_files()
+        self._aggregate_handles: Dict[str, Any] = {}
+
+        # Project directories already created this run; skips the
+        # stat+mkdir syscall pair on every conversation after the first
+        # one in a project
+        self._created_dirs: Set[Path] = set()
+
+        # Constructor arguments for re-creating this extractor inside
+        # worker processes (always serial there)
+        self._init_kwargs = {
+            "input_file": input_file,
+            "output_dir": output_dir,
+            "output_format": output_format,
+            "json_format": json_format,
+            "markdown_dir": markdown_dir,
+            "json_dir": json_dir,
+            "json_file": json_file,
+            "preserve_timestamps": preserve_timestamps,
+            "aggregate_markdown": aggregate_markdown,
+        }
 
         # Determine output paths based on configuration
         self.output_paths = self.determine_output_paths(
@@ -152,13 +289,13 @@ class ConversationExtractorV2:
             if "markdown_dir" in self.output_paths:
                 self.output_paths["markdown_dir"].mkdir(parents=True, exist_ok=True)
                 self.logger.debug(
-                    f"Created markdown directory: {self.output_paths['markdown_dir']}"
+                    "Created markdown directory: %s", self.output_paths["markdown_dir"]
                 )
 
             if "json_dir" in self.output_paths:
                 self.output_paths["json_dir"].mkdir(parents=True, exist_ok=True)
                 self.logger.debug(
-                    f"Created JSON directory: {self.output_paths['json_dir']}"
+                    "Created JSON directory: %s", self.output_paths["json_dir"]
                 )
 
             # For single JSON, ensure parent directory exists
@@ -166,51 +303,93 @@ class ConversationExtractorV2:
                 self.output_paths["json_file"].parent.mkdir(parents=True, exist_ok=True)
 
         except PermissionError as e:
-            self.logger.critical(f"Permission denied creating output directory: {e}")
+            self.logger.critical("Permission denied creating output directory: %s", e)
             raise
         except Exception as e:
             log_exception(self.logger, e, "creating output directories")
             raise
 
+    def _iter_conversations(self) -> Any:
+        """Yield conversations from the input export one at a time.
+
+        Exports above STREAM_THRESHOLD_BYTES are streamed with ijson when
+        installed, so the raw file bytes and the parsed document never
+        coexist in memory. Smaller exports use the bulk parser (orjson when
+        available), which is faster for files that fit comfortably in RAM.
+
+        Yields:
+            Conversation dictionaries from the top-level export array
+        """
+        file_size = self.input_file.stat().st_size
+
+        if file_size >= STREAM_THRESHOLD_BYTES:
+            if IJSON_AVAILABLE:
+                self.logger.debug(
+                    "Streaming %s byte export with ijson incremental parser", file_size
+                )
+                with open(self.input_file, "rb") as f:
+                    yield from ijson.items(f, "item")
+                return
+
+            if ORJSON_AVAILABLE:
+                # Without ijson, at least avoid the read() copy: parse
+                # straight off the page cache via mmap so the raw bytes
+                # never occupy an extra heap buffer alongside the parse
+                self.logger.debug("Parsing %s byte export via mmap", file_size)
+                with open(self.input_file, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        yield from orjson.loads(memoryview(mm))
+                return
+
+        if ORJSON_AVAILABLE:
+            # orjson parses the whole export in C; several times faster
+            # than stdlib json on the 100 MB+ files real exports reach
+            yield from orjson.loads(self.input_file.read_bytes())
+        else:
+            with open(self.input_file, "r", encoding="utf-8") as f:
+                yield from json.load(f)
+
     def extract_all(self) -> None:
         """Main extraction process for all conversations."""
-        self.logger.info(f"ChatGPT Conversation Extractor v2.0")
-        self.logger.info(f"{'='*60}")
+        self.logger.info("ChatGPT Conversation Extractor v2.0")
+        self.logger.info("=" * 60)
 
         try:
-            self.logger.info(f"Loading conversations from {self.input_file}")
-            with open(self.input_file, "r", encoding="utf-8") as f:
-                conversations = json.load(f)
+            self.logger.info("Loading conversations from %s", self.input_file)
+            conversations = list(self._iter_conversations())
         except FileNotFoundError:
-            self.logger.critical(f"Input file not found: {self.input_file}")
+            self.logger.critical("Input file not found: %s", self.input_file)
             raise
         except json.JSONDecodeError as e:
             self.logger.critical(
-                f"Invalid JSON in {self.input_file}: Line {e.lineno}, Column {e.colno}"
+                "Invalid JSON in %s: Line %s, Column %s",
+                self.input_file,
+                e.lineno,
+                e.colno,
             )
-            self.logger.debug(f"JSON error details: {e.msg}")
+            self.logger.debug("JSON error details: %s", e.msg)
             raise
         except PermissionError as e:
-            self.logger.critical(f"Permission denied reading {self.input_file}")
+            self.logger.critical("Permission denied reading %s", self.input_file)
             raise
         except Exception as e:
             log_exception(self.logger, e, "loading conversations")
             raise
 
-        self.logger.info(f"Found {len(conversations)} conversations to process")
-        self.logger.info(f"Output directory: {self.output_dir}")
+        self.logger.info("Found %s conversations to process", len(conversations))
+        self.logger.info("Output directory: %s", self.output_dir)
         if self.output_format in ["markdown", "both"]:
             self.logger.info(
-                f"Markdown output: {self.output_paths.get('markdown_dir', 'N/A')}"
+                "Markdown output: %s", self.output_paths.get("markdown_dir", "N/A")
             )
         if self.output_format in ["json", "both"]:
             if self.json_format == "multiple":
                 self.logger.info(
-                    f"JSON output: {self.output_paths.get('json_dir', 'N/A')}"
+                    "JSON output: %s", self.output_paths.get("json_dir", "N/A")
                 )
             else:
                 self.logger.info(
-                    f"JSON output: {self.output_paths.get('json_file', 'N/A')}"
+                    "JSON output: %s", self.output_paths.get("json_file", "N/A")
                 )
 
         progress = ProgressTracker(total=len(conversations))
@@ -222,41 +401,22 @@ class ConversationExtractorV2:
             else None
         )
 
-        for conv in conversations:
-            try:
-                result = self.process_conversation(conv)
-                if result:
-                    metadata, messages, json_data = result
-
-                    # Save markdown if enabled
-                    if self.output_format in ["markdown", "both"]:
-                        content = self.generate_markdown(metadata, messages)
-                        file_path = self.save_markdown_file(metadata, content)
-                        self.markdown_processed += 1
-                        # Sync timestamps for individual files
-                        if self.preserve_timestamps:
-                            self.synchronize_file_timestamps(file_path, metadata)
-
-                    # Handle JSON output
-                    if self.output_format in ["json", "both"]:
-                        if self.json_format == "multiple":
-                            # Save individual JSON file
-                            file_path = self.save_json_multiple(
-                                json_data, self.output_paths["json_dir"]
-                            )
-                            # Sync timestamps for individual files
-                            if self.preserve_timestamps:
-                                self.synchronize_file_timestamps(file_path, metadata)
-                        else:
-                            # Collect for single file
-                            json_conversations.append(json_data)
+        if self.workers > 1 and len(conversations) > 1:
+            self._extract_parallel(conversations, progress, json_conversations)
+        else:
+            for conv in conversations:
+                try:
+                    result = self.process_conversation(conv)
+                    if result:
+                        self._write_conversation_outputs(result, json_conversations)
+                    progress.update(success=True)
+                except Exception as e:
+                    conv_id = conv.get("id", conv.get("conversation_id", "unknown"))
+                    title = conv.get("title", "Untitled")[:50]
+                    self.log_conversion_failure(conv, conv_id, title, e)
+                    progress.update(success=False)
 
-                progress.update(success=True)
-            except Exception as e:
-                conv_id = conv.get("id", conv.get("conversation_id", "unknown"))
-                title = conv.get("title", "Untitled")[:50]
-                self.log_conversion_failure(conv, conv_id, title, e)
-                progress.update(success=False)
+        self._close_aggregate_files()
 
         # Save single JSON file if needed
         if json_conversations is not None and json_conversations:
@@ -266,7 +426,7 @@ class ConversationExtractorV2:
                 )
                 self.json_processed = len(json_conversations)
             except Exception as e:
-                self.logger.error(f"Failed to save consolidated JSON: {e}")
+                self.logger.error("Failed to save consolidated JSON: %s", e)
 
         if not self.logger.handlers:
             print()  # Only print if no logging handlers
@@ -277,6 +437,111 @@ class ConversationExtractorV2:
 
         self.print_summary(progress)
 
+    def _write_conversation_outputs(
+        self,
+        result: Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]],
+        json_conversations: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """Write markdown/JSON outputs for one processed conversation.
+
+        Shared by the serial loop and the parallel path; all file writes
+        stay in the main process so filename collision handling remains
+        deterministic.
+
+        Args:
+            result: (metadata, messages, json_data) from process_conversation
+            json_conversations: Accumulator for single-file JSON mode, or None
+        """
+        metadata, messages, json_data = result
+
+        # Save markdown if enabled
+        if self.output_format in ["markdown", "both"]:
+            content = self.generate_markdown(metadata, messages)
+            if self.aggregate_markdown:
+                # Aggregated files share one mtime; timestamp sync is per
+                # conversation and does not apply here
+                self.save_to_aggregated_file(metadata, content)
+                self.markdown_processed += 1
+            else:
+                file_path = self.save_markdown_file(metadata, content)
+                self.markdown_processed += 1
+                # Sync timestamps for individual files
+                if self.preserve_timestamps:
+                    self.synchronize_file_timestamps(file_path, metadata)
+
+        # Handle JSON output
+        if self.output_format in ["json", "both"]:
+            if self.json_format == "multiple":
+                # Save individual JSON file
+                file_path = self.save_json_multiple(
+                    json_data, self.output_paths["json_dir"]
+                )
+                # Sync timestamps for individual files
+                if self.preserve_timestamps:
+                    self.synchronize_file_timestamps(file_path, metadata)
+            else:
+                # Collect for single file
+                json_conversations.append(json_data)
+
+    def _extract_parallel(
+        self,
+        conversations: List[Dict[str, Any]],
+        progress: ProgressTracker,
+        json_conversations: Optional[List[Dict[str, Any]]],
+    ) -> None:
+        """Process conversations across worker processes, writing in-order.
+
+        Conversation processing (graph traversal, regex scanning, content
+        extraction) is CPU-bound and embarrassingly parallel; batches are
+        farmed out to a ProcessPoolExecutor while schema-tracker state and
+        conversion failures are merged back in the main process. Batch
+        sizing amortizes IPC overhead across conversations.
+
+        Args:
+            conversations: Raw conversation dictionaries from the export
+            progress: Progress tracker updated per conversation
+            json_conversations: Accumulator for single-file JSON mode, or None
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        batch_size = max(1, len(conversations) // (self.workers * 4))
+        batches = [
+            conversations[i : i + batch_size]
+            for i in range(0, len(conversations), batch_size)
+        ]
+        self.logger.info(
+            "Processing %s batches across %s worker processes",
+            len(batches),
+            self.workers,
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self._init_kwargs,),
+        ) as pool:
+            for results, failures, tracker in pool.map(_process_batch, batches):
+                self.schema_tracker.merge(tracker)
+                self.conversion_failures.extend(failures)
+
+                for result in results:
+                    try:
+                        if result:
+                            self._write_conversation_outputs(result, json_conversations)
+                        progress.update(success=True)
+                    except Exception as e:
+                        metadata = result[0] if result else {}
+                        self.log_conversion_failure(
+                            {},
+                            metadata.get("id", "unknown"),
+                            metadata.get("title", "Untitled")[:50],
+                            e,
+                        )
+                        progress.update(success=False)
+
+                for _ in failures:
+                    progress.update(success=False)
+
     def process_conversation(
         self, conv: Dict[str, Any]
     ) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]]:
@@ -352,9 +617,9 @@ class ConversationExtractorV2:
         metadata["title"] = conv.get("title", "Untitled Conversation")
 
         if create_time := conv.get("create_time"):
-            metadata["created"] = datetime.fromtimestamp(create_time).isoformat() + "Z"
+            metadata["created"] = _fromtimestamp(create_time).isoformat() + "Z"
         if update_time := conv.get("update_time"):
-            metadata["updated"] = datetime.fromtimestamp(update_time).isoformat() + "Z"
+            metadata["updated"] = _fromtimestamp(update_time).isoformat() + "Z"
 
         if model := conv.get("default_model_slug"):
             metadata["model"] = model
@@ -522,37 +787,48 @@ class ConversationExtractorV2:
                 ),
             ).get("id")
 
-        # O(n) backward traversal automatically excludes edited branches
+        # O(path) backward traversal automatically excludes edited branches.
+        # The walk touches each node at most once, so the lookups below are
+        # already minimal; bind them to locals to keep the per-step cost at
+        # one dict probe plus direct calls
         messages = []
         node_id = current_node
-        visited = set()  # Prevent infinite loops in malformed graphs
+        visited = acquire_scratch_set()  # Prevent infinite loops in malformed graphs
+        mapping_get = mapping.get
+        tracker = self.schema_tracker
+        track_metadata_keys = tracker.track_metadata_keys
+        track_author_role = tracker.track_author_role
+        track_recipient = tracker.track_recipient
+        track_finish_type = tracker.track_finish_type
+        append_message = messages.append
 
-        while node_id and node_id not in visited:
-            visited.add(node_id)
-            node = mapping.get(node_id)
+        try:
+            while node_id and node_id not in visited:
+                visited.add(node_id)
+                node = mapping_get(node_id)
 
-            if not node:
-                break
+                if not node:
+                    break
 
-            if msg := node.get("message"):
-                if metadata := msg.get("metadata"):
-                    self.schema_tracker.track_metadata_keys(metadata, conv_id)
-
-                if author := msg.get("author"):
-                    if role := author.get("role"):
-                        self.schema_tracker.track_author_role(role, conv_id)
-                    if recipient := author.get("recipient"):
-                        self.schema_tracker.track_recipient(recipient, conv_id)
-
-                if finish_details := msg.get("finish_details"):
-                    if finish_details.get("type"):
-                        self.schema_tracker.track_finish_type(
-                            finish_details["type"], conv_id
-                        )
+                if msg := node.get("message"):
+                    if metadata := msg.get("metadata"):
+                        track_metadata_keys(metadata, conv_id)
 
-                messages.append(msg)
+                    if author := msg.get("author"):
+                        if role := author.get("role"):
+                            track_author_role(role, conv_id)
+                        if recipient := author.get("recipient"):
+                            track_recipient(recipient, conv_id)
 
-            node_id = node.get("parent") if node else None
+                    if finish_details := msg.get("finish_details"):
+                        if finish_details.get("type"):
+                            track_finish_type(finish_details["type"], conv_id)
+
+                    append_message(msg)
+
+                node_id = node.get("parent")
+        finally:
+            release_scratch_set(visited)
 
         return list(reversed(messages))
 
@@ -636,121 +912,98 @@ class ConversationExtractorV2:
         if not messages:
             return messages
 
+        # groupby yields maximal runs of equal role in C; only assistant
+        # runs of two or more need merging, everything else passes through
         merged = []
-        i = 0
-
-        while i < len(messages):
-            current = messages[i]
-
-            if current["role"] != "assistant":
-                merged.append(current)
-                i += 1
+        for role, group in groupby(messages, key=itemgetter("role")):
+            if role != "assistant":
+                merged.extend(group)
                 continue
 
-            if (
-                i + 1 < len(messages)
-                and current["role"] == "assistant"
-                and messages[i + 1]["role"] == "assistant"
-            ):
-
-                combined_content = current["content"]
-
-                # Collect all consecutive assistant messages
-                j = i + 1
-                while j < len(messages) and messages[j]["role"] == "assistant":
-                    combined_content += "\n\n" + messages[j]["content"]
-
-                    if "citations" in messages[j]:
-                        if "citations" not in current:
-                            current["citations"] = []
-                        current["citations"].extend(messages[j]["citations"])
+            run = list(group)
+            if len(run) == 1:
+                merged.append(run[0])
+                continue
 
-                    if "web_urls" in messages[j]:
-                        if "web_urls" not in current:
-                            current["web_urls"] = []
-                        current["web_urls"].extend(messages[j]["web_urls"])
+            merged_msg = {
+                "role": "assistant",
+                "content": "\n\n".join(m["content"] for m in run),
+            }
 
-                    j += 1
+            citation_lists = [m["citations"] for m in run if "citations" in m]
+            if citation_lists:
+                merged_msg["citations"] = [c for lst in citation_lists for c in lst]
 
-                merged_msg = {"role": "assistant", "content": combined_content}
+            url_lists = [m["web_urls"] for m in run if "web_urls" in m]
+            if url_lists:
+                merged_msg["web_urls"] = sorted({u for lst in url_lists for u in lst})
 
-                if "citations" in current:
-                    merged_msg["citations"] = current["citations"]
-                if "web_urls" in current:
-                    merged_msg["web_urls"] = sorted(list(set(current["web_urls"])))
-
-                merged.append(merged_msg)
-                i = j
-            else:
-                merged.append(current)
-                i += 1
+            merged.append(merged_msg)
 
         return merged
 
     def generate_markdown(
         self, metadata: Dict[str, Any], messages: List[Dict[str, Any]]
     ) -> str:
-        """Generate markdown content with YAML frontmatter for conversation."""
+        """Generate markdown content with YAML frontmatter for conversation.
+
+        Output accumulates in a list joined once at the end, so generation
+        stays linear in the output size even for multi-MB conversations.
+        """
         lines = []
+        append = lines.append
 
-        lines.append("---")
+        append("---")
         for key, value in metadata.items():
             if key == "custom_instructions" and isinstance(value, dict):
                 # Format custom instructions as a YAML block string
-                lines.append("custom_instructions: |")
+                append("custom_instructions: |")
                 for inst_key, inst_value in value.items():
                     # Escape the value properly for YAML
                     escaped_value = inst_value.replace("\\", "\\\\").replace('"', '\\"')
-                    lines.append(f'  {inst_key}: "{escaped_value}"')
+                    append(f'  {inst_key}: "{escaped_value}"')
             elif isinstance(value, str) and (":" in value or '"' in value):
-                lines.append(f'{key}: "{value}"')
+                append(f'{key}: "{value}"')
             else:
-                lines.append(f"{key}: {value}")
-        lines.append("---")
-        lines.append("")
+                append(f"{key}: {value}")
+        append("---")
+        append("")
 
-        lines.append(f"# {metadata['title']}")
-        lines.append("")
+        append(f"# {metadata['title']}")
+        append("")
 
         for msg in messages:
             role = msg["role"]
             content = msg["content"]
 
-            if role == "system":
-                lines.append("## System")
-            elif role == "user":
-                lines.append("## User")
-            elif role == "assistant":
-                lines.append("## Assistant")
-            else:
-                lines.append(f"## {role.title()}")
+            append(_ROLE_HEADINGS.get(role) or f"## {role.title()}")
 
             if role == "user" and "files" in msg:
                 for file in msg["files"]:
-                    lines.append(f"[File: {file}]")
+                    append(f"[File: {file}]")
 
-            lines.append(content)
+            append(content)
 
             if "citations" in msg:
-                lines.append("")
-                lines.append("**Citations:**")
+                append("")
+                append("**Citations:**")
                 for citation in msg["citations"]:
                     title = citation.get("title", "Untitled")
                     url = citation.get("url", "")
                     type_ = citation.get("type", "webpage")
 
                     if url:
-                        lines.append(f"- [{type_}] {title} - {url}")
+                        append(f"- [{type_}] {title} - {url}")
                     else:
-                        lines.append(f"- [{type_}] {title}")
+                        append(f"- [{type_}] {title}")
 
             if "web_urls" in msg and msg["web_urls"]:
-                lines.append("")
-                lines.append("**Web Search URLs:**")
+                append("")
+                append("**Web Search URLs:**")
                 for url in msg["web_urls"]:
-                    lines.append(f"- {url}")
+                    append(f"- {url}")
 
-            lines.append("")
+            append("")
 
         return "\n".join(lines)
 
@@ -777,10 +1030,12 @@ class ConversationExtractorV2:
         if project_id := metadata.get("project_id"):
             project_dir = output_dir / project_id
             try:
-                project_dir.mkdir(exist_ok=True)
+                if project_dir not in self._created_dirs:
+                    project_dir.mkdir(exist_ok=True)
+                    self._created_dirs.add(project_dir)
             except PermissionError:
                 self.logger.error(
-                    f"Permission denied creating project directory {project_dir}"
+                    "Permission denied creating project directory %s", project_dir
                 )
                 raise
             except Exception as e:
@@ -792,53 +1047,84 @@ class ConversationExtractorV2:
         else:
             file_path = output_dir / f"{safe_title}.md"
 
-        # Handle filename collisions with numeric suffix
-        if file_path.exists():
+        try:
+            # Exclusive create: one syscall both claims the name and detects
+            # collisions, instead of a separate exists() stat per candidate.
+            # Encode once and write the bytes directly, skipping the
+            # incremental TextIOWrapper encoding layer
+            data = content.encode("utf-8")
             counter = 2
             while True:
-                if metadata.get("project_id"):
-                    new_path = file_path.parent / f"{safe_title} ({counter}).md"
-                else:
-                    new_path = output_dir / f"{safe_title} ({counter}).md"
-
-                if not new_path.exists():
-                    file_path = new_path
+                try:
+                    with open(file_path, "xb") as f:
+                        f.write(data)
                     break
-                counter += 1
-
-        try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            self.logger.debug(f"Successfully wrote {file_path}")
+                except FileExistsError:
+                    # Handle filename collisions with numeric suffix
+                    file_path = file_path.parent / f"{safe_title} ({counter}).md"
+                    counter += 1
+            self.logger.debug("Successfully wrote %s", file_path)
             return file_path
         except PermissionError:
-            self.logger.error(f"Permission denied writing to {file_path}")
+            self.logger.error("Permission denied writing to %s", file_path)
             raise
         except IOError as e:
-            self.logger.error(f"I/O error writing to {file_path}: {e}")
+            self.logger.error("I/O error writing to %s: %s", file_path, e)
             raise
         except Exception as e:
             log_exception(self.logger, e, f"writing to {file_path}")
             raise
 
-    def sanitize_filename(self, title: str, max_length: int = 100) -> str:
-        """Convert title to safe filename."""
-        # Windows/Unix forbidden characters: <>:"/\|?*
-        safe_title = re.sub(r'[<>:"/\\|?*]', "_", title)
+    def save_to_aggregated_file(self, metadata: Dict[str, Any], content: str) -> Path:
+        """Append markdown content to the per-project aggregated file.
 
-        # ASCII control characters (0-31) break filesystem operations
-        safe_title = "".join(char for char in safe_title if ord(char) >= 32)
+        One file per project (project_id.md) plus conversations.md for
+        non-project conversations. Handles stay open across the run so each
+        append is a single buffered write; delimiter anchors carry the
+        conversation id so individual conversations remain addressable.
 
-        if len(safe_title) > max_length:
-            safe_title = safe_title[:max_length].rstrip()
+        Args:
+            metadata: Conversation metadata including id, title and project_id
+            content: Generated markdown content
 
-        # Windows silently strips trailing dots/spaces, causing mismatches
-        safe_title = safe_title.rstrip(". ")
+        Returns:
+            Path to the aggregated markdown file
+        """
+        output_dir = self.output_paths.get("markdown_dir", self.output_dir)
+        key = metadata.get("project_id") or "conversations"
 
-        if not safe_title:
-            safe_title = "untitled"
+        handle = self._aggregate_handles.get(key)
+        if handle is None:
+            file_path = output_dir / f"{key}.md"
+            try:
+                handle = open(file_path, "w", encoding="utf-8")
+            except PermissionError:
+                self.logger.error("Permission denied writing to %s", file_path)
+                raise
+            except Exception as e:
+                log_exception(self.logger, e, f"opening aggregated file {file_path}")
+                raise
+            self._aggregate_handles[key] = handle
+        else:
+            handle.write("\n\n")
 
-        return safe_title
+        handle.write(f"<!-- conversation: {metadata['id']} -->\n\n")
+        handle.write(content)
+        return Path(handle.name)
+
+    def _close_aggregate_files(self) -> None:
+        """Flush and close any open aggregated markdown files."""
+        for key, handle in self._aggregate_handles.items():
+            try:
+                handle.close()
+                self.logger.debug("Closed aggregated file %s", handle.name)
+            except Exception as e:
+                log_exception(self.logger, e, f"closing aggregated file for {key}")
+        self._aggregate_handles.clear()
+
+    def sanitize_filename(self, title: str, max_length: int = 100) -> str:
+        """Convert title to safe filename."""
+        return _sanitize_title(title, max_length)
 
     def generate_json_data(
         self, metadata: Dict[str, Any], messages: List[Dict[str, Any]]
@@ -936,12 +1222,11 @@ class ConversationExtractorV2:
         }
 
         try:
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-            self.logger.info(f"Saved consolidated JSON to {output_path}")
+            _write_json(output_path, export_data)
+            self.logger.info("Saved consolidated JSON to %s", output_path)
             return output_path
         except PermissionError:
-            self.logger.error(f"Permission denied writing to {output_path}")
+            self.logger.error("Permission denied writing to %s", output_path)
             raise
         except Exception as e:
             log_exception(self.logger, e, f"saving JSON to {output_path}")
@@ -968,7 +1253,9 @@ class ConversationExtractorV2:
         if project_id := json_data.get("project_id"):
             if project_id.startswith("g-p-"):
                 project_dir = output_dir / project_id
-                project_dir.mkdir(exist_ok=True)
+                if project_dir not in self._created_dirs:
+                    project_dir.mkdir(exist_ok=True)
+                    self._created_dirs.add(project_dir)
                 output_dir = project_dir
 
         # Handle file collisions with numbered suffixes
@@ -982,13 +1269,12 @@ class ConversationExtractorV2:
                 counter += 1
 
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
-            self.logger.debug(f"Saved JSON to {file_path}")
+            _write_json(file_path, json_data)
+            self.logger.debug("Saved JSON to %s", file_path)
             self.json_processed += 1
             return file_path
         except PermissionError:
-            self.logger.error(f"Permission denied writing to {file_path}")
+            self.logger.error("Permission denied writing to %s", file_path)
             raise
         except Exception as e:
             log_exception(self.logger, e, f"saving JSON to {file_path}")
@@ -1000,7 +1286,8 @@ class ConversationExtractorV2:
         ChatGPT exports use 'Z' suffix consistently, but fallback handles
         timezone-aware strings. Returns None for pre-1970 dates which
         cause filesystem errors on some platforms. Malformed timestamps
-        logged and skipped to maintain processing flow.
+        logged and skipped to maintain processing flow. Parsing is cached
+        since exports repeat the same stamps across conversations.
 
         Args:
             timestamp_str: ISO 8601 formatted timestamp string
@@ -1011,28 +1298,12 @@ class ConversationExtractorV2:
         if not timestamp_str:
             return None
 
-        try:
-            # Handle ChatGPT's specific ISO format with Z suffix
-            if timestamp_str.endswith("Z"):
-                timestamp_str = timestamp_str[:-1] + "+00:00"
-
-            # Parse to datetime
-            dt = datetime.fromisoformat(timestamp_str)
-
-            # Convert to Unix timestamp
-            timestamp = dt.timestamp()
-
-            # Skip pre-1970 dates (negative timestamps)
-            # These cause errors on Windows and older Unix systems
-            if timestamp < 0:
-                self.logger.debug(f"Skipping pre-1970 timestamp: {timestamp_str}")
-                return None
-
-            return timestamp
-
-        except (ValueError, TypeError) as e:
-            self.logger.debug(f"Failed to parse timestamp '{timestamp_str}': {e}")
-            return None
+        timestamp = _parse_iso_timestamp(timestamp_str)
+        if timestamp is None:
+            self.logger.debug(
+                "Skipping unparseable or pre-1970 timestamp: %s", timestamp_str
+            )
+        return timestamp
 
     def synchronize_file_timestamps(
         self, file_path: Path, metadata: Dict[str, Any]
@@ -1072,7 +1343,7 @@ class ConversationExtractorV2:
             # Most Linux filesystems don't support changing creation time
 
         except Exception as e:
-            self.logger.warning(f"Failed to sync timestamps for {file_path}: {e}")
+            self.logger.warning("Failed to sync timestamps for %s: %s", file_path, e)
             self.timestamp_sync_failures += 1
             # Non-critical failure, continue processing
 
@@ -1087,11 +1358,11 @@ class ConversationExtractorV2:
             file_path: Path to file
             timestamp: Unix timestamp for creation time
         """
-        try:
-            import win32file
-            import win32con
-            import pywintypes
+        if not PYWIN32_AVAILABLE:
+            self.logger.debug("pywin32 not available - skipping Windows creation time")
+            return
 
+        try:
             # Convert Unix timestamp to Windows FILETIME
             # Windows epoch is 1601-01-01, Unix is 1970-01-01
             # Difference is 11644473600 seconds
@@ -1113,10 +1384,8 @@ class ConversationExtractorV2:
             win32file.SetFileTime(handle, filetime, None, None)
             win32file.CloseHandle(handle)
 
-        except ImportError:
-            self.logger.debug("pywin32 not available - skipping Windows creation time")
         except Exception as e:
-            self.logger.debug(f"Failed to set Windows creation time: {e}")
+            self.logger.debug("Failed to set Windows creation time: %s", e)
 
     def _set_macos_creation_time(self, file_path: Path, timestamp: float) -> None:
         """macOS-specific creation time setting via xattr.
@@ -1155,9 +1424,9 @@ class ConversationExtractorV2:
             )
 
         except (subprocess.CalledProcessError, FileNotFoundError) as e:
-            self.logger.debug(f"Failed to set macOS creation time: {e}")
+            self.logger.debug("Failed to set macOS creation time: %s", e)
         except Exception as e:
-            self.logger.debug(f"Unexpected error setting macOS creation time: {e}")
+            self.logger.debug("Unexpected error setting macOS creation time: %s", e)
 
     def print_summary(self, progress: ProgressTracker) -> None:
         """Print extraction summary with format-specific statistics."""
@@ -1167,26 +1436,26 @@ class ConversationExtractorV2:
         self.logger.info("=" * 60)
         self.logger.info("EXTRACTION COMPLETE!")
         self.logger.info("=" * 60)
-        self.logger.info(f"  Total conversations: {stats['total']}")
+        self.logger.info("  Total conversations: %s", stats["total"])
         self.logger.info(
-            f"  Successfully processed: {stats['processed'] - stats['failed']}"
+            "  Successfully processed: %s", stats["processed"] - stats["failed"]
         )
-        self.logger.info(f"  Failed: {stats['failed']}")
-        self.logger.info(f"  Success rate: {stats['success_rate']:.1f}%")
+        self.logger.info("  Failed: %s", stats["failed"])
+        self.logger.info("  Success rate: %.1f%%", stats["success_rate"])
 
         # Format-specific statistics
         if self.output_format in ["markdown", "both"]:
-            self.logger.info(f"  Markdown files created: {self.markdown_processed}")
+            self.logger.info("  Markdown files created: %s", self.markdown_processed)
         if self.output_format in ["json", "both"]:
-            self.logger.info(f"  JSON files created: {self.json_processed}")
+            self.logger.info("  JSON files created: %s", self.json_processed)
         if self.preserve_timestamps and self.timestamp_sync_failures > 0:
             self.logger.info(
-                f"  Timestamp sync failures: {self.timestamp_sync_failures}"
+                "  Timestamp sync failures: %s", self.timestamp_sync_failures
             )
 
-        self.logger.info(f"  Time elapsed: {stats['elapsed_time']:.1f}s")
-        self.logger.info(f"  Processing rate: {stats['rate']:.1f} conv/s")
-        self.logger.info(f"  Output directory: {self.output_dir}")
+        self.logger.info("  Time elapsed: %.1fs", stats["elapsed_time"])
+        self.logger.info("  Processing rate: %.1f conv/s", stats["rate"])
+        self.logger.info("  Output directory: %s", self.output_dir)
         self.logger.info("=" * 60)
 
     def save_schema_report(self) -> None:
@@ -1197,9 +1466,9 @@ class ConversationExtractorV2:
         try:
             with open(report_path, "w", encoding="utf-8") as f:
                 f.write(report)
-            self.logger.debug(f"Schema report saved to {report_path}")
+            self.logger.debug("Schema report saved to %s", report_path)
         except Exception as e:
-            self.logger.warning(f"Failed to save schema report: {e}")
+            self.logger.warning("Failed to save schema report: %s", e)
 
     def log_conversion_failure(
         self, conv: Dict[str, Any], conv_id: str, title: str, error: Exception
@@ -1304,69 +1573,124 @@ class ConversationExtractorV2:
         log_path = self.output_dir / "conversion_log.log"
 
         try:
-            with open(log_path, "w", encoding="utf-8") as f:
-                f.write("=" * 80 + "\n")
-                f.write("CONVERSATION EXTRACTION FAILURE LOG\n")
-                f.write(f"Generated: {datetime.now().isoformat()}\n")
-                f.write(f"Total Failures: {len(self.conversion_failures)}\n")
-                f.write("=" * 80 + "\n\n")
-
-                categories: Dict[str, int] = defaultdict(int)
-                for fail in self.conversion_failures:
-                    categories[fail["category"]] += 1
-
-                f.write("FAILURE CATEGORIES:\n")
-                for cat, count in sorted(
-                    categories.items(), key=lambda x: x[1], reverse=True
-                ):
-                    f.write(f"  {cat}: {count}\n")
-                f.write("\n")
-
-                f.write("FAILED CONVERSATION IDs:\n")
-                for fail in self.conversion_failures:
-                    f.write(f"  - {fail['conversation_id']}\n")
-                f.write("\n")
-
-                f.write("=" * 80 + "\n")
-                f.write("DETAILED FAILURE INFORMATION\n")
-                f.write("=" * 80 + "\n\n")
-
-                for i, fail in enumerate(self.conversion_failures, 1):
-                    f.write(f"Failure #{i}\n")
-                    f.write(f"ID: {fail['conversation_id']}\n")
-                    f.write(f"Title: {fail['title']}\n")
-                    f.write(f"Category: {fail['category']}\n")
-                    f.write(f"Error Type: {fail['error_type']}\n")
-                    f.write(f"Error: {fail['error_message']}\n")
-
-                    if fail["structural_issues"]:
-                        f.write(
-                            f"Structural Issues: {', '.join(fail['structural_issues'])}\n"
+            # Build the report in memory and write it in one call instead
+            # of paying the encode+write path per line
+            parts = []
+            append = parts.append
+            append("=" * 80 + "\n")
+            append("CONVERSATION EXTRACTION FAILURE LOG\n")
+            append(f"Generated: {datetime.now().isoformat()}\n")
+            append(f"Total Failures: {len(self.conversion_failures)}\n")
+            append("=" * 80 + "\n\n")
+
+            categories: Dict[str, int] = defaultdict(int)
+            for fail in self.conversion_failures:
+                categories[fail["category"]] += 1
+
+            append("FAILURE CATEGORIES:\n")
+            for cat, count in sorted(
+                categories.items(), key=lambda x: x[1], reverse=True
+            ):
+                append(f"  {cat}: {count}\n")
+            append("\n")
+
+            append("FAILED CONVERSATION IDs:\n")
+            for fail in self.conversion_failures:
+                append(f"  - {fail['conversation_id']}\n")
+            append("\n")
+
+            append("=" * 80 + "\n")
+            append("DETAILED FAILURE INFORMATION\n")
+            append("=" * 80 + "\n\n")
+
+            for i, fail in enumerate(self.conversion_failures, 1):
+                append(f"Failure #{i}\n")
+                append(f"ID: {fail['conversation_id']}\n")
+                append(f"Title: {fail['title']}\n")
+                append(f"Category: {fail['category']}\n")
+                append(f"Error Type: {fail['error_type']}\n")
+                append(f"Error: {fail['error_message']}\n")
+
+                if fail.get("structural_issues"):
+                    append(
+                        f"Structural Issues: {', '.join(fail['structural_issues'])}\n"
+                    )
+
+                if fail.get("problematic_nodes"):
+                    append("\nProblematic Nodes (sample):\n")
+                    for node in fail["problematic_nodes"][:3]:
+                        append(f"  - Node {node['node_id']}: role={node.get('role')}, ")
+                        append(
+                            f"content_type={node.get('content_type')}, issue={node.get('issue')}\n"
                         )
 
-                    if fail["problematic_nodes"]:
-                        f.write(f"\nProblematic Nodes (sample):\n")
-                        for node in fail["problematic_nodes"][:3]:
-                            f.write(
-                                f"  - Node {node['node_id']}: role={node.get('role')}, "
-                            )
-                            f.write(
-                                f"content_type={node.get('content_type')}, issue={node.get('issue')}\n"
-                            )
+                if fail.get("trace_snippet"):
+                    append(f"\nTrace: {fail['trace_snippet']}\n")
 
-                    if fail["trace_snippet"]:
-                        f.write(f"\nTrace: {fail['trace_snippet']}\n")
+                append("\n" + "=" * 80 + "\n\n")
 
-                    f.write("\n" + "=" * 80 + "\n\n")
+            # JSON format enables programmatic failure analysis; encoded
+            # incrementally so large failure lists never materialize the
+            # whole document as one string
+            json_path = self.output_dir / "conversion_failures.json"
+            try:
+                encoder = json.JSONEncoder(indent=2, default=str)
+                with open(json_path, "w", encoding="utf-8") as jf:
+                    jf.writelines(encoder.iterencode(self.conversion_failures))
+                append("\nJSON version saved to: conversion_failures.json\n")
+            except Exception as e:
+                self.logger.warning("Failed to save JSON failure log: %s", e)
 
-                # JSON format enables programmatic failure analysis
-                json_path = self.output_dir / "conversion_failures.json"
-                try:
-                    with open(json_path, "w", encoding="utf-8") as jf:
-                        json.dump(self.conversion_failures, jf, indent=2, default=str)
-                    f.write(f"\nJSON version saved to: conversion_failures.json\n")
-                except Exception as e:
-                    self.logger.warning(f"Failed to save JSON failure log: {e}")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.write("".join(parts))
         except Exception as e:
-            self.logger.warning(f"Failed to save conversion log: {e}")
+            self.logger.warning("Failed to save conversion log: %s", e)
             # Non-critical, so we don't raise
+
+
+# Per-process worker state for parallel extraction. Each worker builds its
+# own extractor (and therefore its own tracker) once, then processes batches
+# serially; results and tracker state flow back to the main process.
+_worker_extractor: Optional[ConversationExtractorV2] = None
+
+
+def _init_worker(init_kwargs: Dict[str, Any]) -> None:
+    """Build the per-process extractor used by _process_batch."""
+    global _worker_extractor
+    _worker_extractor = ConversationExtractorV2(**init_kwargs)
+
+
+def _process_batch(
+    conversations: List[Dict[str, Any]],
+) -> Tuple[
+    List[Optional[Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, Any]]]],
+    List[Dict[str, Any]],
+    SchemaEvolutionTracker,
+]:
+    """Process one batch of conversations in a worker process.
+
+    Returns:
+        Tuple of (per-conversation results, failure records, tracker state).
+        The tracker is reset after each batch so observations are reported
+        exactly once to the main process.
+    """
+    extractor = _worker_extractor
+    results = []
+
+    for conv in conversations:
+        try:
+            results.append(extractor.process_conversation(conv))
+        except Exception as e:
+            conv = conv or {}
+            conv_id = conv.get("id", conv.get("conversation_id", "unknown"))
+            title = conv.get("title", "Untitled")[:50]
+            extractor.log_conversion_failure(conv, conv_id, title, e)
+
+    failures = extractor.conversion_failures
+    extractor.conversion_failures = []
+
+    tracker = extractor.schema_tracker
+    extractor.schema_tracker = SchemaEvolutionTracker()
+    extractor.message_processor.tracker = extractor.schema_tracker
+
+    return results, failures, tracker
@@ -5,9 +5,11 @@ This module provides structured logging with multiple handlers for different
 severity levels, progress bar compatibility, and containerization support.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 import json
 import traceback
@@ -15,7 +17,6 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, Union
 
-
 DEFAULT_LOG_FORMAT = (
     "[%(asctime)s] [%(levelname)-8s] [%(name)s:%(funcName)s:%(lineno)d] - %(message)s"
 )
@@ -29,6 +30,47 @@ LOG_CRITICAL_FILE = "extraction_critical.log"
 
 MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB
 BACKUP_COUNT = 5
+LOG_WRITE_BUFFER_SIZE = 64 * 1024  # Coalesce log writes into fewer syscalls
+
+# Project-root log directory, resolved once at import so repeated
+# setup_logging calls skip the path walk (and stay stable under symlinks)
+_DEFAULT_LOG_DIR = Path(__file__).resolve().parents[2] / LOG_DIR_NAME
+
+# Optional C-implemented JSON encoder for the structured-logging path
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Standard LogRecord attributes excluded when copying extra fields;
+# frozenset membership beats the former 22-element list scan per key
+_LOGRECORD_STD_KEYS = frozenset(
+    {
+        "name",
+        "msg",
+        "args",
+        "created",
+        "filename",
+        "funcName",
+        "levelname",
+        "levelno",
+        "lineno",
+        "module",
+        "msecs",
+        "message",
+        "pathname",
+        "process",
+        "processName",
+        "relativeCreated",
+        "thread",
+        "threadName",
+        "exc_info",
+        "exc_text",
+        "stack_info",
+    }
+)
 
 
 class MillisecondFormatter(logging.Formatter):
@@ -45,23 +87,78 @@ class MillisecondFormatter(logging.Formatter):
         return s
 
     def format(self, record):
+        # Multiple handlers share each record; format it only once
+        cached = getattr(record, "_cached_text", None)
+        if cached is not None:
+            return cached
+
         # __main__ becomes 'main' for cleaner log output
         if record.module == "__main__":
             record.module = "main"
 
-        # Add exception info if present
-        if record.exc_info:
-            # Don't pass exc_info to parent to avoid duplicate traceback
-            exc_info = record.exc_info
+        # Format the traceback once per record via logging's exc_text
+        # cache so additional handlers reuse it instead of re-rendering
+        if record.exc_info and not record.exc_text:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info))
+
+        if record.exc_text:
+            # Temporarily hide exception state so the parent formatter
+            # doesn't append its own copy of the traceback
+            exc_info, exc_text = record.exc_info, record.exc_text
             record.exc_info = None
+            record.exc_text = None
+            result = super().format(record)
+            record.exc_info = exc_info
+            record.exc_text = exc_text
+            result += f"\nTraceback:\n{exc_text}"
+        else:
             result = super().format(record)
-            if exc_info:
-                result += (
-                    f"\nTraceback:\n{''.join(traceback.format_exception(*exc_info))}"
-                )
-            return result
 
-        return super().format(record)
+        record._cached_text = result
+        return result
+
+
+class CachedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler that avoids per-emit filesystem stat calls.
+
+    The stdlib shouldRollover runs os.path.exists/os.path.isfile on every
+    record. This variant short-circuits using the open stream position
+    when the record clearly fits under maxBytes, deferring to the stdlib
+    check only near the rollover boundary.
+
+    Writes go through an enlarged buffer, and the per-record flush is
+    skipped for records below WARNING so routine INFO traffic coalesces
+    into fewer write syscalls. WARNING and above still flush immediately,
+    and close/rollover/shutdown drain the buffer as usual.
+    """
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=LOG_WRITE_BUFFER_SIZE,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record):
+        self._defer_flush = record.levelno < logging.WARNING
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False
+
+    def flush(self):
+        if getattr(self, "_defer_flush", False):
+            return
+        super().flush()
+
+    def shouldRollover(self, record):
+        if self.maxBytes > 0 and self.stream is not None:
+            msg = f"{self.format(record)}\n"
+            if self.stream.tell() + len(msg) < self.maxBytes:
+                return False
+        return super().shouldRollover(record)
 
 
 class TqdmLoggingHandler(logging.StreamHandler):
@@ -91,6 +188,11 @@ class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging in containerized environments."""
 
     def format(self, record):
+        # Multiple handlers share each record; serialize it only once
+        cached = getattr(record, "_cached_json", None)
+        if cached is not None:
+            return cached
+
         log_obj = {
             "timestamp": datetime.fromtimestamp(record.created).isoformat(),
             "level": record.levelname,
@@ -113,32 +215,21 @@ class JSONFormatter(logging.Formatter):
 
         # Add extra fields if any
         for key, value in record.__dict__.items():
-            if key not in [
-                "name",
-                "msg",
-                "args",
-                "created",
-                "filename",
-                "funcName",
-                "levelname",
-                "levelno",
-                "lineno",
-                "module",
-                "msecs",
-                "message",
-                "pathname",
-                "process",
-                "processName",
-                "relativeCreated",
-                "thread",
-                "threadName",
-                "exc_info",
-                "exc_text",
-                "stack_info",
-            ]:
+            if key not in _LOGRECORD_STD_KEYS:
                 log_obj[key] = value
 
-        return json.dumps(log_obj, default=str)
+        if ORJSON_AVAILABLE:
+            result = orjson.dumps(log_obj, default=str).decode()
+        else:
+            result = json.dumps(log_obj, default=str)
+        record._cached_json = result
+        return result
+
+
+def _stop_queue_listener(listener: logging.handlers.QueueListener) -> None:
+    """Stop a queue listener, tolerating repeated stop calls."""
+    if listener._thread is not None:
+        listener.stop()
 
 
 def setup_logging(
@@ -169,6 +260,12 @@ def setup_logging(
     root_logger.setLevel(level)
     root_logger.handlers.clear()
 
+    # Stop any listener from a previous setup_logging call so its thread
+    # and file handles are released before new handlers are installed
+    if listener := getattr(root_logger, "_queue_listener", None):
+        _stop_queue_listener(listener)
+        root_logger._queue_listener = None
+
     # Determine console level
     if console_level is None:
         console_level = level
@@ -192,65 +289,79 @@ def setup_logging(
 
     # File handlers (if not disabled)
     if not disable_file_logging:
-        if log_dir is None:
-            # Find the project root (where the script is located)
-            # This ensures logs are always created in the same place
-            script_dir = Path(__file__).parent.parent.parent  # Up to project root
-            log_dir = script_dir / LOG_DIR_NAME
-        else:
-            log_dir = Path(log_dir)
+        # Default to the project root so logs always land in the same place
+        log_dir = _DEFAULT_LOG_DIR if log_dir is None else Path(log_dir)
 
         # Create log directory with error handling
         try:
             log_dir.mkdir(parents=True, exist_ok=True)
         except Exception as e:
-            root_logger.error(f"Failed to create log directory {log_dir}: {e}")
+            root_logger.error("Failed to create log directory %s: %s", log_dir, e)
             return root_logger
 
+        # File handlers run behind a queue so hot-path log calls only pay
+        # for a queue.put; formatting and file I/O happen on the listener
+        # thread instead of the processing thread
+        file_handlers = []
+
         # Processing log (INFO and above)
         try:
-            processing_handler = logging.handlers.RotatingFileHandler(
+            processing_handler = CachedRotatingFileHandler(
                 log_dir / LOG_PROCESSING_FILE,
                 maxBytes=MAX_LOG_SIZE,
                 backupCount=BACKUP_COUNT,
             )
             processing_handler.setLevel(logging.INFO)
             processing_handler.setFormatter(formatter)
-            root_logger.addHandler(processing_handler)
+            file_handlers.append(processing_handler)
         except Exception as e:
-            root_logger.error(f"Failed to create processing log handler: {e}")
+            root_logger.error("Failed to create processing log handler: %s", e)
 
         # Error log (ERROR and above)
         try:
-            error_handler = logging.handlers.RotatingFileHandler(
+            error_handler = CachedRotatingFileHandler(
                 log_dir / LOG_ERROR_FILE,
                 maxBytes=MAX_LOG_SIZE,
                 backupCount=BACKUP_COUNT,
             )
             error_handler.setLevel(logging.ERROR)
             error_handler.setFormatter(formatter)
-            root_logger.addHandler(error_handler)
+            file_handlers.append(error_handler)
         except Exception as e:
-            root_logger.error(f"Failed to create error log handler: {e}")
+            root_logger.error("Failed to create error log handler: %s", e)
 
         # Critical log (CRITICAL only)
         try:
-            critical_handler = logging.handlers.RotatingFileHandler(
+            critical_handler = CachedRotatingFileHandler(
                 log_dir / LOG_CRITICAL_FILE,
                 maxBytes=MAX_LOG_SIZE // 2,  # Smaller size for critical
                 backupCount=BACKUP_COUNT,
             )
             critical_handler.setLevel(logging.CRITICAL)
             critical_handler.setFormatter(formatter)
-            root_logger.addHandler(critical_handler)
+            file_handlers.append(critical_handler)
         except Exception as e:
-            root_logger.error(f"Failed to create critical log handler: {e}")
+            root_logger.error("Failed to create critical log handler: %s", e)
+
+        if file_handlers:
+            log_queue: queue.SimpleQueue = queue.SimpleQueue()
+            root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+            listener = logging.handlers.QueueListener(
+                log_queue, *file_handlers, respect_handler_level=True
+            )
+            listener.start()
+            # Keep a reference for teardown; stop on exit to flush writes
+            root_logger._queue_listener = listener
+            atexit.register(_stop_queue_listener, listener)
 
     # Log initial configuration
     root_logger.info(
-        f"Logging configured - Level: {logging.getLevelName(level)}, "
-        f"JSON: {use_json}, tqdm: {use_tqdm}, "
-        f"File logging: {not disable_file_logging}"
+        "Logging configured - Level: %s, JSON: %s, tqdm: %s, File logging: %s",
+        logging.getLevelName(level),
+        use_json,
+        use_tqdm,
+        not disable_file_logging,
     )
 
     return root_logger
@@ -2,18 +2,127 @@
 Message processing components for content extraction and filtering.
 """
 
+import io
 import re
 from typing import Dict, List, Optional, Any
 
-from .trackers import SchemaEvolutionTracker
+from .trackers import (
+    SchemaEvolutionTracker,
+    acquire_scratch_set,
+    release_scratch_set,
+)
+
+# Compiled once at import; URL scanning runs on the hot message-processing path
+_URL_PATTERN = r'https?://[^\s<>"]+'
+_URL_RE = re.compile(_URL_PATTERN)
+
+# Optional DFA-based engine (google-re2) for bulk scanning of large result
+# blobs; falls back to the stdlib backtracking matcher when unavailable
+try:
+    import re2 as _re2
+
+    _URL_RE_FAST = _re2.compile(_URL_PATTERN)
+except ImportError:
+    _URL_RE_FAST = _URL_RE
+
+
+def _find_urls(text: str) -> List[str]:
+    """Scan text for URLs using the fastest available regex engine."""
+    return _URL_RE_FAST.findall(text)
+
+
+# Shared empty dict for `or _EMPTY` fallbacks on the filter hot path
+_EMPTY: Dict[str, Any] = {}
+
+# Parts count above which extract_from_parts streams into a StringIO
+# buffer instead of accumulating a list for a final join
+_PARTS_BUFFER_THRESHOLD = 8
+
+# Internal content types excluded from output; frozenset gives O(1) lookup
+_FILTER_CONTENT_TYPES = frozenset(
+    {"model_editable_context", "thoughts", "reasoning_recap"}
+)
+
+# OpenAI wrapper text around custom instructions; precomputed so the
+# user_editable_context handler avoids per-call literal construction
+_CI_MARKER_RE = re.compile(
+    r"^.*The user provided the following information.*$", re.MULTILINE
+)
+_CI_WRAPPERS = (
+    "The user provided the following information about themselves:",
+    "The user provided the additional info about how they would like you to respond:",
+)
+
+
+def _format_image_part(part: Dict[str, Any]) -> str:
+    """Format an image_asset_pointer part - defensive metadata handling."""
+    metadata = part.get("metadata")
+    if metadata is not None:
+        # Check for DALL-E prompt in nested structure
+        dalle_dict = metadata.get("dalle")
+        if dalle_dict is not None and isinstance(dalle_dict, dict):
+            if dalle_prompt := dalle_dict.get("prompt"):
+                return f"[DALL-E Image: {dalle_prompt}]"
+            return "[Image]"
+        if dalle_prompt := metadata.get("dalle_prompt"):
+            return f"[DALL-E Image: {dalle_prompt}]"
+    return "[Image]"
+
+
+def _format_audio_transcription_part(part: Dict[str, Any]) -> Optional[str]:
+    """Format an audio transcription part."""
+    text = part.get("text", "")
+    if text:
+        return f"[Audio transcription]\n{text}"
+    return None
+
+
+def _format_code_interpreter_part(part: Dict[str, Any]) -> Optional[str]:
+    """Format a code interpreter output part."""
+    output = part.get("output", "")
+    if output:
+        return f"```output\n{output}\n```"
+    return None
+
+
+# Dispatch table for multimodal part types; one dict lookup per part
+# replaces the chained content_type comparisons in extract_from_parts
+_PART_HANDLERS = {
+    "image_asset_pointer": _format_image_part,
+    "audio_transcription": _format_audio_transcription_part,
+    "audio_asset_pointer": lambda part: "[Audio file]",
+    "video_asset_pointer": lambda part: "[Video file]",
+    "real_time_user_audio_video_asset_pointer": (
+        lambda part: "[Voice conversation with video]"
+    ),
+    "code_interpreter_output": _format_code_interpreter_part,
+}
 
 
 class MessageProcessor:
     """Process and filter messages with enhanced content handling."""
 
+    # No per-instance dict; methods here run once per message, so
+    # attribute access cost matters
+    __slots__ = ("tracker", "_content_handlers")
+
     def __init__(self, tracker: SchemaEvolutionTracker):
         self.tracker = tracker
 
+        # Dispatch table built once; single dict lookup replaces the
+        # content_type if/elif cascade on the per-message hot path
+        self._content_handlers = {
+            "text": self._extract_parts_content,
+            "multimodal_text": self._extract_parts_content,
+            "code": self._extract_code,
+            "execution_output": self._extract_execution_output,
+            "user_editable_context": self._extract_user_context,
+            "tether_browsing_display": self._extract_browsing_display,
+            "tether_quote": self._extract_tether_quote,
+            "sonic_webpage": self._extract_sonic_webpage,
+            "system_error": self._extract_system_error,
+        }
+
     def should_filter_message(self, msg: Dict[str, Any]) -> bool:
         """Determine if message should be filtered out.
 
@@ -23,34 +132,37 @@ class MessageProcessor:
         Returns:
             True if message should be excluded from output
         """
+        # Pull all fields into locals up front; this runs once per message
+        metadata = msg.get("metadata") or _EMPTY
+        author = msg.get("author") or _EMPTY
+        content = msg.get("content") or _EMPTY
+        author_role = author.get("role")
+        content_type = content.get("content_type", "")
+
         # Check if visually hidden
-        metadata = msg.get("metadata", {})
         if metadata.get("is_visually_hidden_from_conversation"):
             return True
 
-        author = msg.get("author", {})
-        author_role = author.get("role")
-
-        # Filter internal system messages (but keep user system messages)
-        if author_role == "system" and not self.is_user_system_message(msg):
+        # Filter internal system messages (but keep user system messages);
+        # is_user_system_message is inlined to skip a method call per message
+        if (
+            author_role == "system"
+            and not metadata.get("is_user_system_message")
+            and content_type != "user_editable_context"
+        ):
             return True
 
         # Filter tool messages unless they contain DALL-E images
-        if author_role == "tool":
-            content = msg.get("content", {})
-            if not self._contains_dalle_image(content):
-                return True
+        if author_role == "tool" and not self._contains_dalle_image(content):
+            return True
 
         # Filter specific content types
-        content = msg.get("content", {})
-        content_type = content.get("content_type", "")
-
-        if content_type in ["model_editable_context", "thoughts", "reasoning_recap"]:
+        if content_type in _FILTER_CONTENT_TYPES:
             return True
 
         # Filter empty assistant placeholder messages
         if (
-            author.get("role") == "assistant"
+            author_role == "assistant"
             and content_type == "text"
             and content.get("parts") == [""]
         ):
@@ -58,7 +170,8 @@ class MessageProcessor:
 
         return False
 
-    def _contains_dalle_image(self, content: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _contains_dalle_image(content: Dict[str, Any]) -> bool:
         """Check if content contains DALL-E generated image."""
         if content.get("content_type") == "multimodal_text":
             for part in content.get("parts", []):
@@ -103,101 +216,122 @@ class MessageProcessor:
         if content_type:
             self.tracker.track_content_type(content_type, conv_id)
 
-        if content_type == "text":
-            # Standard text message
-            parts = content.get("parts", [])
-            if parts:
-                return self.extract_from_parts(parts, conv_id)
-
-        elif content_type == "code":
-            # Code message with language
-            text = content.get("text", "")
-            lang = content.get("language", "")
-            if text:
-                return f"```{lang}\n{text}\n```"
-
-        elif content_type == "execution_output":
-            # Code execution output
-            text = content.get("text", "")
-            if text:
-                return f"```output\n{text}\n```"
-
-        elif content_type == "multimodal_text":
-            # Mixed content (text, images, etc.)
-            parts = content.get("parts", [])
-            if parts:
-                return self.extract_from_parts(parts, conv_id)
-
-        elif content_type == "user_editable_context":  # Custom GPT instructions
-            text = content.get("text", "")
-            if text:
-                # Strip OpenAI's wrapper text from custom instructions
-                lines = text.split("\n")
-                result_lines = []
-                in_instructions = False
-
-                for line in lines:
-                    if "The user provided the following information" in line:
-                        in_instructions = True
-                    elif in_instructions:
-                        result_lines.append(line)
-
-                result = "\n".join(result_lines).strip()
-                # If extraction failed, try direct wrapper removal
-                if not result or len(result) > len(text) * 0.9:
-                    result = text
-                    for wrapper in [
-                        "The user provided the following information about themselves:",
-                        "The user provided the additional info about how they would like you to respond:",
-                    ]:
-                        result = result.replace(wrapper, "").strip()
-
-                return result if result else None
-
-        elif content_type == "tether_browsing_display":  # Rendered webpage
-            result = content.get("result", "")
-            if result:
-                return result
-
-        elif content_type == "tether_quote":  # Web search citation
-            title = content.get("title", "")
-            text = content.get("text", "")
-            url = content.get("url", "")
-
-            parts = []
-            if title:
-                parts.append(f"**{title}**")
-            if text:
-                parts.append(f"> {text}")
-            if url:
-                parts.append(f"Source: {url}")
+        if handler := self._content_handlers.get(content_type):
+            return handler(content, conv_id)
+
+        if content_type:
+            return self._extract_generic(content, content_type, conv_id)
 
-            return "\n".join(parts) if parts else None
+        return None
+
+    def _extract_parts_content(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle text and multimodal_text content via parts array."""
+        parts = content.get("parts", [])
+        if parts:
+            return self.extract_from_parts(parts, conv_id)
+        return None
 
-        elif content_type == "sonic_webpage":  # Web reader content
-            text = content.get("text", "")
-            url = content.get("url", "")
-            if text:
+    def _extract_code(self, content: Dict[str, Any], conv_id: str) -> Optional[str]:
+        """Handle code content with language fence."""
+        text = content.get("text", "")
+        lang = content.get("language", "")
+        if text:
+            return f"```{lang}\n{text}\n```"
+        return None
+
+    def _extract_execution_output(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle code execution output."""
+        text = content.get("text", "")
+        if text:
+            return f"```output\n{text}\n```"
+        return None
+
+    def _extract_user_context(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle custom GPT instructions (user_editable_context)."""
+        text = content.get("text", "")
+        if text:
+            # Strip OpenAI's wrapper text: everything after the first
+            # wrapper line, extracted in a single regex pass
+            pieces = _CI_MARKER_RE.split(text, maxsplit=1)
+            result = pieces[1].strip() if len(pieces) > 1 else ""
+
+            # If extraction failed, try direct wrapper removal
+            if not result or len(result) > len(text) * 0.9:
                 result = text
-                if url:
-                    result = f"[Web Content from {url}]\n{result}"
-                return result
+                for wrapper in _CI_WRAPPERS:
+                    result = result.replace(wrapper, "")
+                result = result.strip()
+
+            return result if result else None
+        return None
 
-        elif content_type == "system_error":
-            error_text = content.get("text", "")
-            error_name = content.get("name", "Error")
-            return f"[System Error: {error_name}]\n{error_text}"
+    def _extract_browsing_display(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle rendered webpage content (tether_browsing_display)."""
+        result = content.get("result", "")
+        if result:
+            return result
+        return None
 
-        elif content_type:
-            # Unknown content type - attempt generic extraction
-            self.tracker.track_content_type(content_type, conv_id)
+    def _extract_tether_quote(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle web search citation (tether_quote)."""
+        title = content.get("title", "")
+        text = content.get("text", "")
+        url = content.get("url", "")
+
+        parts = []
+        if title:
+            parts.append(f"**{title}**")
+        if text:
+            parts.append(f"> {text}")
+        if url:
+            parts.append(f"Source: {url}")
+
+        return "\n".join(parts) if parts else None
+
+    def _extract_sonic_webpage(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle web reader content (sonic_webpage)."""
+        text = content.get("text", "")
+        url = content.get("url", "")
+        if text:
+            result = text
+            if url:
+                result = f"[Web Content from {url}]\n{result}"
+            return result
+        return None
 
-            # Try common fields
-            if text := content.get("text"):
-                return text
-            if parts := content.get("parts"):
-                return self.extract_from_parts(parts, conv_id)
+    def _extract_system_error(
+        self, content: Dict[str, Any], conv_id: str
+    ) -> Optional[str]:
+        """Handle system error messages."""
+        error_text = content.get("text", "")
+        error_name = content.get("name", "Error")
+        return f"[System Error: {error_name}]\n{error_text}"
+
+    def _extract_generic(
+        self, content: Dict[str, Any], content_type: str, conv_id: str
+    ) -> Optional[str]:
+        """Attempt generic extraction for unknown content types.
 
+        The content type was already tracked by extract_message_content,
+        so no second tracker call is needed here.
+        """
+        # Try common fields
+        if text := content.get("text"):
+            return text
+        if parts := content.get("parts"):
+            return self.extract_from_parts(parts, conv_id)
         return None
 
     def extract_from_parts(self, parts: List[Any], conv_id: str) -> Optional[str]:
@@ -210,7 +344,21 @@ class MessageProcessor:
         if not parts:  # Empty list
             return None
 
-        result_parts = []
+        # Large multimodal conversations stream into a StringIO buffer to
+        # avoid holding every fragment plus the joined result in memory;
+        # small ones keep the cheaper list+join
+        buffer = io.StringIO() if len(parts) >= _PARTS_BUFFER_THRESHOLD else None
+        if buffer is not None:
+            write = buffer.write
+
+            def append(piece: str) -> None:
+                write(piece)
+                write("\n")
+
+        else:
+            result_parts = []
+            append = result_parts.append  # Local binding for the hot loop
+        track_part_type = self.tracker.track_part_type
 
         for part in parts:
             if part is None:  # Defensive: Handle None parts gracefully
@@ -219,62 +367,26 @@ class MessageProcessor:
             if isinstance(part, str):
                 # Simple text part
                 if part:
-                    result_parts.append(part)
+                    append(part)
 
             elif isinstance(part, dict):
                 # Complex part (could be image, file, etc.)
                 part_type = part.get("content_type", "")
 
                 if part_type:
-                    self.tracker.track_part_type(part_type, conv_id)
-
-                if part_type == "image_asset_pointer":
-                    # Image reference - defensive metadata handling
-                    metadata = part.get("metadata")
-                    if metadata is not None:
-                        # Check for DALL-E prompt in nested structure
-                        dalle_dict = metadata.get("dalle")
-                        if dalle_dict is not None and isinstance(dalle_dict, dict):
-                            if dalle_prompt := dalle_dict.get("prompt"):
-                                result_parts.append(f"[DALL-E Image: {dalle_prompt}]")
-                            else:
-                                result_parts.append("[Image]")
-                        elif dalle_prompt := metadata.get("dalle_prompt"):
-                            result_parts.append(f"[DALL-E Image: {dalle_prompt}]")
-                        else:
-                            result_parts.append("[Image]")
-                    else:
-                        result_parts.append("[Image]")
-
-                elif part_type == "audio_transcription":
-                    # Audio transcription
-                    text = part.get("text", "")
-                    if text:
-                        result_parts.append(f"[Audio transcription]\n{text}")
-
-                elif part_type == "audio_asset_pointer":
-                    # Audio file reference
-                    result_parts.append("[Audio file]")
-
-                elif part_type == "video_asset_pointer":
-                    # Video file reference
-                    result_parts.append("[Video file]")
-
-                elif part_type == "real_time_user_audio_video_asset_pointer":
-                    # Real-time voice conversation with video
-                    result_parts.append("[Voice conversation with video]")
-
-                elif part_type == "code_interpreter_output":
-                    # Code interpreter output
-                    output = part.get("output", "")
-                    if output:
-                        result_parts.append(f"```output\n{output}\n```")
+                    track_part_type(part_type, conv_id)
 
+                if handler := _PART_HANDLERS.get(part_type):
+                    if formatted := handler(part):
+                        append(formatted)
                 else:
                     # Unknown part type - try to extract text
                     if text := part.get("text"):
-                        result_parts.append(text)
+                        append(text)
 
+        if buffer is not None:
+            result = buffer.getvalue()
+            return result[:-1] if result else None
         return "\n".join(result_parts) if result_parts else None
 
     def extract_citations(self, msg: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -317,62 +429,64 @@ class MessageProcessor:
         5. Content result text (regex)
         6. Parts array text (regex)
         """
-        urls = set()
+        urls = acquire_scratch_set()
+        try:
+            scan_texts = []  # Free-text candidates, regex-scanned in one pass
 
-        content = msg.get("content", {})
-        content_type = content.get("content_type", "")
+            content = msg.get("content", {})
+            content_type = content.get("content_type", "")
 
-        # Different extraction based on content type
-        if content_type == "tether_quote":
-            # Extract from tether_quote
-            if url := content.get("url"):
-                urls.add(url)
-            if domain := content.get("domain"):
-                urls.add(f"https://{domain}")
-
-        elif content_type == "tether_browsing_display":
-            # Check result field for URLs
-            if result := content.get("result"):
-                # Critical: Use module-level 're' (local import caused 89% of failures)
-                url_pattern = r'https?://[^\s<>"]+'
-                found_urls = re.findall(url_pattern, str(result))
-                urls.update(found_urls)
-
-            # Check for URL in other fields
-            if url := content.get("url"):
-                urls.add(url)
-
-        elif content_type == "sonic_webpage":
-            # Extract from sonic webpage
-            if url := content.get("url"):
-                urls.add(url)
-            if domain := content.get("domain"):
-                urls.add(f"https://{domain}")
-
-        # Generic URL extraction from any content type
-        # Check citations
-        citations = msg.get("metadata", {}).get("citations", [])
-        for citation in citations:
-            if citation_meta := citation.get("metadata"):
-                if url := citation_meta.get("url"):
+            # Different extraction based on content type
+            if content_type == "tether_quote":
+                # Extract from tether_quote
+                if url := content.get("url"):
                     urls.add(url)
+                if domain := content.get("domain"):
+                    urls.add(f"https://{domain}")
 
-        # Check parts for text containing URLs
-        if "parts" in content:
-            parts = content.get("parts", [])
-            if isinstance(parts, list):
-                for part in parts:
-                    if isinstance(part, str):
-                        # Extract URLs from text parts
-                        url_pattern = r'https?://[^\s<>"]+'
-                        found_urls = re.findall(url_pattern, part)
-                        urls.update(found_urls)
+            elif content_type == "tether_browsing_display":
+                # Check result field for URLs
+                if result := content.get("result"):
+                    # Critical: Use module-level regex (local import caused 89% of failures)
+                    scan_texts.append(str(result))
+
+                # Check for URL in other fields
+                if url := content.get("url"):
+                    urls.add(url)
+
+            elif content_type == "sonic_webpage":
+                # Extract from sonic webpage
+                if url := content.get("url"):
+                    urls.add(url)
+                if domain := content.get("domain"):
+                    urls.add(f"https://{domain}")
+
+            # Generic URL extraction from any content type
+            # Check citations
+            citations = msg.get("metadata", {}).get("citations", [])
+            for citation in citations:
+                if citation_meta := citation.get("metadata"):
+                    if url := citation_meta.get("url"):
+                        urls.add(url)
+
+            # Check parts for text containing URLs
+            if "parts" in content:
+                parts = content.get("parts", [])
+                if isinstance(parts, list):
+                    scan_texts.extend(p for p in parts if isinstance(p, str) and p)
+
+            # One regex pass over all collected text instead of a scan per field
+            if scan_texts:
+                urls.update(_find_urls("\n".join(scan_texts)))
+
+            # Check conversation-level safe_urls
+            if conv_data and "safe_urls" in conv_data:
+                urls.update(conv_data["safe_urls"])
 
-        # Check conversation-level safe_urls
-        if conv_data and "safe_urls" in conv_data:
-            urls.update(conv_data["safe_urls"])
+            return sorted(urls)
 
-        return sorted(list(urls))
+        finally:
+            release_scratch_set(urls)
 
     def extract_file_names(self, msg: Dict[str, Any]) -> List[str]:
         """Extract uploaded file names from message attachments."""
@@ -2,11 +2,13 @@
 Tracking components for schema evolution and progress monitoring.
 """
 
-import time
+import heapq
+import io
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Set, Any
-from collections import defaultdict
-from datetime import datetime
+from time import monotonic as _monotonic, strftime as _strftime, time as _now
+from typing import Any, Deque, Dict, List, Set
+from collections import deque
 
 try:
     from tqdm import tqdm
@@ -16,7 +18,44 @@ except ImportError:
     TQDM_AVAILABLE = False
 
 
-@dataclass
+# Prebuilt display template; filled via str.format in show_progress
+_PROGRESS_TEMPLATE = (
+    "\r  Progress: {}/{} ({:.1f}%) | Failed: {} | Rate: {:.1f}/s | ETA: {}"
+)
+
+
+# Pool of reusable scratch sets for per-conversation de-duplication;
+# callers pair acquire_scratch_set() with release_scratch_set() in finally
+_scratch_set_pool: List[Set[Any]] = []
+
+
+def acquire_scratch_set() -> Set[Any]:
+    """Get a cleared scratch set, reusing a pooled one when available."""
+    if _scratch_set_pool:
+        return _scratch_set_pool.pop()
+    return set()
+
+
+def release_scratch_set(scratch: Set[Any]) -> None:
+    """Clear a scratch set and return it to the pool for reuse."""
+    scratch.clear()
+    _scratch_set_pool.append(scratch)
+
+
+# dataclass slots= arrived in 3.10; stay a no-op on the 3.9 floor
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _sample_buffers() -> Dict[str, Deque[str]]:
+    """Bounded buffers for unknown-pattern samples (module-level for pickling)."""
+    return {
+        "content_types": deque(maxlen=10),
+        "author_roles": deque(maxlen=10),
+        "part_types": deque(maxlen=10),
+    }
+
+
+@dataclass(**_DATACLASS_OPTS)
 class SchemaEvolutionTracker:
     """Track unknown patterns and schema changes."""
 
@@ -26,159 +65,211 @@ class SchemaEvolutionTracker:
     metadata_keys: Set[str] = field(default_factory=set)
     part_types: Set[str] = field(default_factory=set)
     finish_types: Set[str] = field(default_factory=set)
-    unknown_samples: Dict[str, List[str]] = field(
-        default_factory=lambda: defaultdict(list)
+    unknown_samples: Dict[str, Deque[str]] = field(default_factory=_sample_buffers)
+
+    KNOWN_CONTENT_TYPES = frozenset(
+        {
+            "text",
+            "code",
+            "multimodal_text",
+            "execution_output",
+            "tether_quote",
+            "tether_browsing_display",
+            "user_editable_context",
+            "model_editable_context",
+            "thoughts",
+            "reasoning_recap",
+            "sonic_webpage",
+            "system_error",
+        }
     )
 
-    KNOWN_CONTENT_TYPES = {
-        "text",
-        "code",
-        "multimodal_text",
-        "execution_output",
-        "tether_quote",
-        "tether_browsing_display",
-        "user_editable_context",
-        "model_editable_context",
-        "thoughts",
-        "reasoning_recap",
-        "sonic_webpage",
-        "system_error",
-    }
-
-    KNOWN_ROLES = {"system", "user", "assistant", "tool"}
+    KNOWN_ROLES = frozenset({"system", "user", "assistant", "tool"})
 
-    KNOWN_PART_TYPES = {
-        "image_asset_pointer",
-        "audio_transcription",
-        "audio_asset_pointer",
-        "video_asset_pointer",
-        "code_interpreter_output",
-    }
+    KNOWN_PART_TYPES = frozenset(
+        {
+            "image_asset_pointer",
+            "audio_transcription",
+            "audio_asset_pointer",
+            "video_asset_pointer",
+            "code_interpreter_output",
+        }
+    )
 
     def track_content_type(self, content_type: str, conv_id: str) -> None:
-        """Track content types, capturing first 10 unknown patterns."""
-        self.content_types.add(content_type)
-        if content_type and content_type not in self.KNOWN_CONTENT_TYPES:
-            if len(self.unknown_samples["content_types"]) < 10:
-                self.unknown_samples["content_types"].append(
-                    f"{conv_id}: {content_type}"
-                )
+        """Track content types, capturing up to 10 unknown pattern samples."""
+        # Already-seen fast path: the observation set doubles as a memo, so
+        # repeat sightings of known types (the overwhelming majority) cost
+        # two membership probes and skip the intern/add work
+        if content_type in self.content_types:
+            if content_type in self.KNOWN_CONTENT_TYPES or not content_type:
+                return
+        else:
+            if content_type:
+                content_type = sys.intern(content_type)
+            self.content_types.add(content_type)
+            if not content_type or content_type in self.KNOWN_CONTENT_TYPES:
+                return
+        samples = self.unknown_samples["content_types"]
+        if len(samples) < 10:
+            samples.append(f"{conv_id}: {content_type}")
 
     def track_author_role(self, role: str, conv_id: str) -> None:
         """Track message author roles with unknown sample collection."""
-        self.author_roles.add(role)
-        if role and role not in self.KNOWN_ROLES:
-            if len(self.unknown_samples["author_roles"]) < 10:
-                self.unknown_samples["author_roles"].append(f"{conv_id}: {role}")
+        if role in self.author_roles:
+            if role in self.KNOWN_ROLES or not role:
+                return
+        else:
+            if role:
+                role = sys.intern(role)
+            self.author_roles.add(role)
+            if not role or role in self.KNOWN_ROLES:
+                return
+        samples = self.unknown_samples["author_roles"]
+        if len(samples) < 10:
+            samples.append(f"{conv_id}: {role}")
 
     def track_recipient(self, recipient: str, conv_id: str) -> None:
         """Track tool recipient identifiers for schema discovery."""
         if recipient:
-            self.recipient_values.add(recipient)
+            self.recipient_values.add(sys.intern(recipient))
 
     def track_metadata_keys(self, metadata: Dict[str, Any], conv_id: str) -> None:
         """Discover metadata schema from field presence patterns."""
         if metadata:
-            for key in metadata.keys():
-                self.metadata_keys.add(key)
+            self.metadata_keys.update(metadata)
 
     def track_part_type(self, part_type: str, conv_id: str) -> None:
         """Track multimodal part types (images, audio, video)."""
-        self.part_types.add(part_type)
-        if part_type and part_type not in self.KNOWN_PART_TYPES:
-            if len(self.unknown_samples["part_types"]) < 10:
-                self.unknown_samples["part_types"].append(f"{conv_id}: {part_type}")
+        if part_type in self.part_types:
+            if part_type in self.KNOWN_PART_TYPES or not part_type:
+                return
+        else:
+            if part_type:
+                part_type = sys.intern(part_type)
+            self.part_types.add(part_type)
+            if not part_type or part_type in self.KNOWN_PART_TYPES:
+                return
+        samples = self.unknown_samples["part_types"]
+        if len(samples) < 10:
+            samples.append(f"{conv_id}: {part_type}")
 
     def track_finish_type(self, finish_type: str, conv_id: str) -> None:
         """Track conversation termination reasons (stop, error, etc.)."""
         if finish_type:
-            self.finish_types.add(finish_type)
+            self.finish_types.add(sys.intern(finish_type))
+
+    def merge(self, other: "SchemaEvolutionTracker") -> None:
+        """Merge observations from another tracker (e.g. a worker process).
+
+        Args:
+            other: Tracker whose accumulated state should be folded in
+        """
+        self.content_types |= other.content_types
+        self.author_roles |= other.author_roles
+        self.recipient_values |= other.recipient_values
+        self.metadata_keys |= other.metadata_keys
+        self.part_types |= other.part_types
+        self.finish_types |= other.finish_types
+
+        for key, samples in other.unknown_samples.items():
+            existing = self.unknown_samples[key]
+            for sample in samples:
+                if len(existing) >= 10:
+                    break
+                if sample not in existing:
+                    existing.append(sample)
 
     def generate_report(self) -> str:
         """Generate evolution tracking report."""
-        report = []
-        report.append("=" * 60)
-        report.append("SCHEMA EVOLUTION TRACKING REPORT")
-        report.append(f"Generated: {datetime.now().isoformat()}")
-        report.append("=" * 60)
-        report.append("")
-
-        report.append("## Content Types")
-        known = self.content_types & self.KNOWN_CONTENT_TYPES
+        buf = io.StringIO()
+        _write = buf.write
+
+        def append(line: str) -> None:
+            _write(line)
+            _write("\n")
+
+        append("=" * 60)
+        append("SCHEMA EVOLUTION TRACKING REPORT")
+        append(f"Generated: {_strftime('%Y-%m-%dT%H:%M:%S')}")
+        append("=" * 60)
+        append("")
+
+        append("## Content Types")
         unknown = self.content_types - self.KNOWN_CONTENT_TYPES
-        report.append(f"  Known types found: {len(known)}")
-        report.append(f"  Unknown types found: {len(unknown)}")
+        append(f"  Known types found: {len(self.content_types) - len(unknown)}")
+        append(f"  Unknown types found: {len(unknown)}")
         if unknown:
-            report.append("  Unknown types:")
+            append("  Unknown types:")
             for ct in sorted(unknown):
-                report.append(f"    - {ct}")
+                append(f"    - {ct}")
             if self.unknown_samples["content_types"]:
-                report.append("  Sample conversations:")
-                for sample in self.unknown_samples["content_types"][:3]:
-                    report.append(f"    {sample}")
-        report.append("")
+                append("  Sample conversations:")
+                for sample in list(self.unknown_samples["content_types"])[:3]:
+                    append(f"    {sample}")
+        append("")
 
-        report.append("## Author Roles")
-        known = self.author_roles & self.KNOWN_ROLES
+        append("## Author Roles")
         unknown = self.author_roles - self.KNOWN_ROLES
-        report.append(f"  Known roles found: {len(known)}")
-        report.append(f"  Unknown roles found: {len(unknown)}")
+        append(f"  Known roles found: {len(self.author_roles) - len(unknown)}")
+        append(f"  Unknown roles found: {len(unknown)}")
         if unknown:
-            report.append("  Unknown roles:")
+            append("  Unknown roles:")
             for role in sorted(unknown):
-                report.append(f"    - {role}")
+                append(f"    - {role}")
             if self.unknown_samples["author_roles"]:
-                report.append("  Sample conversations:")
-                for sample in self.unknown_samples["author_roles"][:3]:
-                    report.append(f"    {sample}")
-        report.append("")
+                append("  Sample conversations:")
+                for sample in list(self.unknown_samples["author_roles"])[:3]:
+                    append(f"    {sample}")
+        append("")
 
-        report.append("## Part Types in Multimodal Content")
-        known = self.part_types & self.KNOWN_PART_TYPES
+        append("## Part Types in Multimodal Content")
         unknown = self.part_types - self.KNOWN_PART_TYPES
-        report.append(f"  Known part types: {len(known)}")
-        report.append(f"  Unknown part types: {len(unknown)}")
+        append(f"  Known part types: {len(self.part_types) - len(unknown)}")
+        append(f"  Unknown part types: {len(unknown)}")
         if unknown:
-            report.append("  Unknown part types:")
+            append("  Unknown part types:")
             for pt in sorted(unknown):
-                report.append(f"    - {pt}")
+                append(f"    - {pt}")
             if self.unknown_samples["part_types"]:
-                report.append("  Sample conversations:")
-                for sample in self.unknown_samples["part_types"][:3]:
-                    report.append(f"    {sample}")
-        report.append("")
+                append("  Sample conversations:")
+                for sample in list(self.unknown_samples["part_types"])[:3]:
+                    append(f"    {sample}")
+        append("")
 
         if self.recipient_values:
-            report.append("## Recipients (Tools)")
-            report.append(f"  Unique recipients found: {len(self.recipient_values)}")
-            for recipient in sorted(self.recipient_values)[:10]:
-                report.append(f"    - {recipient}")
-            report.append("")
+            append("## Recipients (Tools)")
+            append(f"  Unique recipients found: {len(self.recipient_values)}")
+            for recipient in heapq.nsmallest(10, self.recipient_values):
+                append(f"    - {recipient}")
+            append("")
 
         if self.finish_types:
-            report.append("## Finish Types")
-            report.append(f"  Unique finish types found: {len(self.finish_types)}")
+            append("## Finish Types")
+            append(f"  Unique finish types found: {len(self.finish_types)}")
             for ft in sorted(self.finish_types):
-                report.append(f"    - {ft}")
-            report.append("")
+                append(f"    - {ft}")
+            append("")
 
         if self.metadata_keys:
-            report.append("## Metadata Keys")
-            report.append(f"  Total unique keys: {len(self.metadata_keys)}")
-            report.append("")
+            append("## Metadata Keys")
+            append(f"  Total unique keys: {len(self.metadata_keys)}")
+            append("")
 
-        return "\n".join(report)
+        return buf.getvalue()[:-1]
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class ProgressTracker:
     """Enhanced progress tracking with ETA."""
 
     total: int
     processed: int = 0
     failed: int = 0
-    start_time: float = field(default_factory=time.time)
-    last_update: float = field(default_factory=time.time)
+    start_time: float = field(default_factory=_now)
+    # Heartbeat throttle runs on the monotonic clock so wall-clock jumps
+    # (NTP adjustments, DST) can't suppress or spam progress output
+    last_update: float = field(default_factory=_monotonic)
 
     def update(self, success: bool = True) -> None:
         """Increment counters and trigger display at milestones."""
@@ -186,20 +277,21 @@ class ProgressTracker:
         if not success:
             self.failed += 1
 
-        # Update display: every 100 items, at completion, or every 5 seconds
-        current_time = time.time()
-        if (
-            self.processed % 100 == 0
-            or self.processed == self.total
-            or current_time - self.last_update > 5
-        ):  # Also update every 5 seconds
+        # Milestone fast path: every 100 items or at completion
+        if self.processed % 100 == 0 or self.processed == self.total:
+            self.show_progress()
+            self.last_update = _monotonic()
+            return
 
+        # Slow path: 5-second heartbeat between milestones
+        now = _monotonic()
+        if now - self.last_update > 5:
             self.show_progress()
-            self.last_update = current_time
+            self.last_update = now
 
     def show_progress(self) -> None:
         """Display progress with ETA."""
-        elapsed = time.time() - self.start_time
+        elapsed = _now() - self.start_time
 
         if elapsed > 0:
             rate = self.processed / elapsed
@@ -216,19 +308,21 @@ class ProgressTracker:
         else:
             eta_str = f"{eta/60:.1f}m"
 
-        progress_msg = (
-            f"  Progress: {self.processed}/{self.total} ({percent:.1f}%) | "
-            f"Failed: {self.failed} | Rate: {rate:.1f}/s | ETA: {eta_str}"
+        progress_msg = _PROGRESS_TEMPLATE.format(
+            self.processed, self.total, percent, self.failed, rate, eta_str
         )
 
         if TQDM_AVAILABLE:
-            tqdm.write(f"\r{progress_msg}", end="", file=None, nolock=True)
+            tqdm.write(progress_msg, end="", file=None, nolock=True)
         else:
-            print(f"\r{progress_msg}", end="", flush=True)
+            # Bound at call time so pytest's capsys stdout swap still works
+            write = sys.stdout.write
+            write(progress_msg)
+            sys.stdout.flush()
 
     def final_stats(self) -> Dict[str, Any]:
         """Return final statistics."""
-        elapsed = time.time() - self.start_time
+        elapsed = _now() - self.start_time
         success_rate = (
             ((self.processed - self.failed) / self.processed * 100)
             if self.processed > 0
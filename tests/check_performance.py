@@ -8,6 +8,18 @@ import sys
 import argparse
 from pathlib import Path
 
+# One alternation covering every metric; group names double as metric keys
+_METRIC_RE = re.compile(
+    r"Processing rate: (?P<processing_rate>[\d.]+) conv/s"
+    r"|Success rate: (?P<success_rate>[\d.]+)%"
+    r"|Total conversations: (?P<total_conversations>\d+)"
+    r"|Failed: (?P<failed_conversations>\d+)"
+    r"|Time elapsed: (?P<elapsed_time>[\d.]+)s"
+    r"|Maximum resident set size \(kbytes\): (?P<max_memory_kb>\d+)"
+)
+
+_FLOAT_METRICS = frozenset({"processing_rate", "success_rate", "elapsed_time"})
+
 
 def parse_performance_log(log_file: str) -> dict:
     """Parse performance metrics from extraction log."""
@@ -16,41 +28,27 @@ def parse_performance_log(log_file: str) -> dict:
         print(f"Log file not found: {log_file}")
         sys.exit(1)
 
-    with open(log_file, "r") as f:
-        content = f.read()
-
     metrics = {}
+    remaining = _METRIC_RE.groups
 
-    # Extract processing rate
-    rate_match = re.search(r"Processing rate: ([\d.]+) conv/s", content)
-    if rate_match:
-        metrics["processing_rate"] = float(rate_match.group(1))
-
-    # Extract success rate
-    success_match = re.search(r"Success rate: ([\d.]+)%", content)
-    if success_match:
-        metrics["success_rate"] = float(success_match.group(1))
-
-    # Extract total conversations
-    total_match = re.search(r"Total conversations: (\d+)", content)
-    if total_match:
-        metrics["total_conversations"] = int(total_match.group(1))
-
-    # Extract failed count
-    failed_match = re.search(r"Failed: (\d+)", content)
-    if failed_match:
-        metrics["failed_conversations"] = int(failed_match.group(1))
-
-    # Extract elapsed time
-    time_match = re.search(r"Time elapsed: ([\d.]+)s", content)
-    if time_match:
-        metrics["elapsed_time"] = float(time_match.group(1))
-
-    # Extract memory info from /usr/bin/time -v
-    memory_match = re.search(r"Maximum resident set size \(kbytes\): (\d+)", content)
-    if memory_match:
-        metrics["max_memory_kb"] = int(memory_match.group(1))
-        metrics["max_memory_mb"] = int(memory_match.group(1)) / 1024
+    # Stream line by line; stop as soon as every metric has been seen
+    with open(log_file, "r") as f:
+        for line in f:
+            match = _METRIC_RE.search(line)
+            if match is None:
+                continue
+            name = match.lastgroup
+            if name in metrics:
+                continue  # keep first occurrence, matching old re.search behavior
+            value = match.group(name)
+            metrics[name] = float(value) if name in _FLOAT_METRICS else int(value)
+            remaining -= 1
+            if remaining == 0:
+                break
+
+    # Memory info comes from /usr/bin/time -v output
+    if "max_memory_kb" in metrics:
+        metrics["max_memory_mb"] = metrics["max_memory_kb"] / 1024
 
     return metrics
 
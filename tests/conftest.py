@@ -6,8 +6,18 @@ import pytest
 import sys
 from pathlib import Path
 
-# Add src to path for all tests
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add src to path for all tests; guarded so re-imports (e.g. one per
+# xdist worker reusing the interpreter) don't stack duplicate entries
+_SRC = str(Path(__file__).parent.parent / "src")
+if _SRC not in sys.path:
+    sys.path.insert(0, _SRC)
+
+
+@pytest.fixture(scope="session")
+def empty_export_bytes():
+    """Serialized empty export, shared by tests that only need a valid
+    input file; written with a single write_bytes call."""
+    return b"[]"
 
 
 def pytest_configure(config):
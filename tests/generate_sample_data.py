@@ -5,131 +5,174 @@ Generate sample conversation data for testing and benchmarking.
 
 import json
 import argparse
+import multiprocessing
 import random
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
 
-def generate_conversation(index: int, complexity: str = "simple") -> dict:
-    """Generate a single conversation with specified complexity."""
-
-    base_time = int(datetime(2024, 1, 1).timestamp())
-
-    if complexity == "simple":
-        # Simple 2-message conversation
-        return {
-            "id": f"conv-{index:06d}",
-            "title": f"Conversation {index}: {random.choice(['Python Help', 'Code Review', 'Debug Issue', 'Learning Question'])}",
-            "create_time": base_time + index * 3600,
-            "update_time": base_time + index * 3600 + 1800,
-            "mapping": {
-                "node-1": {
-                    "id": "node-1",
-                    "parent": None,
-                    "children": ["node-2"],
-                    "message": None,
-                },
-                "node-2": {
-                    "id": "node-2",
-                    "parent": "node-1",
-                    "children": ["node-3"],
-                    "message": {
-                        "author": {"role": "user"},
-                        "content": {
-                            "content_type": "text",
-                            "parts": [
-                                f"Question {index}: How do I implement {random.choice(['sorting', 'searching', 'hashing', 'recursion'])}?"
-                            ],
-                        },
-                    },
-                },
-                "node-3": {
-                    "id": "node-3",
-                    "parent": "node-2",
-                    "children": [],
-                    "message": {
-                        "author": {"role": "assistant"},
-                        "content": {
-                            "content_type": "text",
-                            "parts": [
-                                f"Answer {index}: Here's how you can implement that...\n```python\n# Example code\nprint('Hello')\n```"
-                            ],
-                        },
-                    },
-                },
-            },
-            "current_node": "node-3",
-            "default_model_slug": random.choice(
-                ["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"]
-            ),
-        }
-
-    elif complexity == "complex":
-        # Complex conversation with branches, multiple content types
-        nodes = {
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Static choice pools, hoisted so the generator does not rebuild list
+# literals on every call
+_TITLES = ("Python Help", "Code Review", "Debug Issue", "Learning Question")
+_TOPICS = ("sorting", "searching", "hashing", "recursion")
+_MODELS = ("gpt-3.5-turbo", "gpt-4", "gpt-4-turbo")
+_CONTENT_TYPES = ("text", "code", "multimodal_text")
+_VERBS = ("Explain", "Show me", "How does", "What is")
+
+# Structural constants for the complex-conversation chain (nodes 3..7)
+_CHAIN_IDS = tuple(f"node-{i}" for i in range(3, 8))
+
+# Message templates with the verb/topic baked in; only the index is
+# substituted per node
+_MSG_TEMPLATES = tuple(f"Message {{i}}: {v} something" for v in _VERBS)
+_QUESTION_TEMPLATE = "Question {i}: How do I implement {t}?"
+_ANSWER_TEMPLATE = (
+    "Answer {i}: Here's how you can implement that..."
+    "\n```python\n# Example code\nprint('Hello')\n```"
+)
+
+# Epoch of the synthetic corpus, computed once at import
+_BASE_TIME = int(datetime(2024, 1, 1).timestamp())
+
+# Constant author fragments, shared by reference; the corpus is only ever
+# serialized, so aliasing is safe
+_USER = {"role": "user"}
+_ASSISTANT = {"role": "assistant"}
+_SYSTEM = {"role": "system"}
+
+
+def _simple(
+    index: int, title: str = None, topic: str = None, model: str = None
+) -> dict:
+    """Generate a simple 2-message conversation."""
+    choice = random.choice
+
+    return {
+        "id": f"conv-{index:06d}",
+        "title": f"Conversation {index}: {title or choice(_TITLES)}",
+        "create_time": _BASE_TIME + index * 3600,
+        "update_time": _BASE_TIME + index * 3600 + 1800,
+        "mapping": {
             "node-1": {
                 "id": "node-1",
                 "parent": None,
                 "children": ["node-2"],
                 "message": None,
+            },
+            "node-2": {
+                "id": "node-2",
+                "parent": "node-1",
+                "children": ["node-3"],
+                "message": {
+                    "author": _USER,
+                    "content": {
+                        "content_type": "text",
+                        "parts": [
+                            _QUESTION_TEMPLATE.format(
+                                i=index, t=topic or choice(_TOPICS)
+                            )
+                        ],
+                    },
+                },
+            },
+            "node-3": {
+                "id": "node-3",
+                "parent": "node-2",
+                "children": [],
+                "message": {
+                    "author": _ASSISTANT,
+                    "content": {
+                        "content_type": "text",
+                        "parts": [_ANSWER_TEMPLATE.format(i=index)],
+                    },
+                },
+            },
+        },
+        "current_node": "node-3",
+        "default_model_slug": model or choice(_MODELS),
+    }
+
+
+def _complex(
+    index: int, title: str = None, topic: str = None, model: str = None
+) -> dict:
+    """Generate a complex conversation with branches and mixed content."""
+    choice = random.choice
+
+    # One bulk draw decides citation presence for the whole chain (30%
+    # per node, matching the old per-node random() > 0.7 check)
+    cite_flags = random.choices(
+        (False, True), cum_weights=(0.7, 1.0), k=len(_CHAIN_IDS)
+    )
+
+    # Draw all per-node content first, then build the mapping in one go
+    specs = []
+    parent = "node-2"
+    for i, node_id in enumerate(_CHAIN_IDS, start=3):
+        # Randomly decide content type
+        content_type = choice(_CONTENT_TYPES)
+
+        if content_type == "text":
+            content = {
+                "content_type": "text",
+                "parts": [choice(_MSG_TEMPLATES).format(i=i)],
             }
-        }
+        elif content_type == "code":
+            content = {
+                "content_type": "code",
+                "text": f"def function_{i}():\n    return {i}",
+                "language": "python",
+            }
+        else:  # multimodal_text
+            content = {
+                "content_type": "multimodal_text",
+                "parts": [
+                    f"Text part {i}",
+                    {
+                        "content_type": "image_asset_pointer",
+                        "metadata": {"dalle": {"prompt": f"Image {i}"}},
+                    },
+                ],
+            }
+
+        specs.append((node_id, parent, i, content, cite_flags[i - 3]))
+        parent = node_id
 
-        # Add system message
-        nodes["node-2"] = {
+    # Single allocation sized to the final mapping; no incremental growth
+    nodes = {
+        "node-1": {
+            "id": "node-1",
+            "parent": None,
+            "children": ["node-2"],
+            "message": None,
+        },
+        "node-2": {
             "id": "node-2",
             "parent": "node-1",
             "children": ["node-3"],
             "message": {
-                "author": {"role": "system"},
+                "author": _SYSTEM,
                 "content": {
                     "content_type": "text",
                     "parts": ["You are a helpful coding assistant."],
                 },
                 "metadata": {"is_user_system_message": True},
             },
-        }
-
-        # Add conversation with branches
-        parent = "node-2"
-        for i in range(3, 8):
-            node_id = f"node-{i}"
-
-            # Randomly decide content type
-            content_types = ["text", "code", "multimodal_text"]
-            content_type = random.choice(content_types)
-
-            if content_type == "text":
-                content = {
-                    "content_type": "text",
-                    "parts": [
-                        f"Message {i}: {random.choice(['Explain', 'Show me', 'How does', 'What is'])} something"
-                    ],
-                }
-            elif content_type == "code":
-                content = {
-                    "content_type": "code",
-                    "text": f"def function_{i}():\n    return {i}",
-                    "language": "python",
-                }
-            else:  # multimodal_text
-                content = {
-                    "content_type": "multimodal_text",
-                    "parts": [
-                        f"Text part {i}",
-                        {
-                            "content_type": "image_asset_pointer",
-                            "metadata": {"dalle": {"prompt": f"Image {i}"}},
-                        },
-                    ],
-                }
-
-            nodes[node_id] = {
-                "id": node_id,
-                "parent": parent,
+        },
+        **{
+            nid: {
+                "id": nid,
+                "parent": p,
                 "children": [],
                 "message": {
-                    "author": {"role": "user" if i % 2 else "assistant"},
+                    "author": _USER if i % 2 else _ASSISTANT,
                     "content": content,
                     "metadata": {
                         "citations": (
@@ -141,48 +184,73 @@ def generate_conversation(index: int, complexity: str = "simple") -> dict:
                                     }
                                 }
                             ]
-                            if random.random() > 0.7
+                            if cite
                             else []
                         )
                     },
                 },
             }
-
-            # Update parent's children
-            nodes[parent]["children"].append(node_id)
-            parent = node_id
-
-        # Add a branch (edit)
-        nodes["node-3"]["children"].append("node-3b")
-        nodes["node-3b"] = {
+            for (nid, p, i, content, cite) in specs
+        },
+        "node-3b": {
             "id": "node-3b",
             "parent": "node-3",
             "children": [],
             "message": {
-                "author": {"role": "user"},
+                "author": _USER,
                 "content": {
                     "content_type": "text",
                     "parts": ["Actually, let me rephrase that..."],
                 },
             },
-        }
-
-        return {
-            "id": f"complex-{index:06d}",
-            "title": f"Complex Conversation {index}",
-            "create_time": base_time + index * 7200,
-            "update_time": base_time + index * 7200 + 3600,
-            "mapping": nodes,
-            "current_node": f"node-7",
-            "conversation_template_id": (
-                f"g-p-project-{index % 3}" if index % 3 == 0 else None
-            ),
-            "default_model_slug": "gpt-4",
-            "safe_urls": [f"https://safe{index}.com"],
-            "moderation_results": [],
-        }
-
-    return generate_conversation(index, "simple")  # fallback
+        },
+    }
+
+    # Wire up the chain children in one pass; node-3 also owns the edit branch
+    for nid, p, _, _, _ in specs:
+        nodes[p]["children"].append(nid)
+    nodes["node-3"]["children"].append("node-3b")
+
+    return {
+        "id": f"complex-{index:06d}",
+        "title": f"Complex Conversation {index}",
+        "create_time": _BASE_TIME + index * 7200,
+        "update_time": _BASE_TIME + index * 7200 + 3600,
+        "mapping": nodes,
+        "current_node": "node-7",
+        "conversation_template_id": (
+            f"g-p-project-{index % 3}" if index % 3 == 0 else None
+        ),
+        "default_model_slug": "gpt-4",
+        "safe_urls": [f"https://safe{index}.com"],
+        "moderation_results": [],
+    }
+
+
+_GENERATORS = {"simple": _simple, "complex": _complex}
+
+
+def _generate_task(task: tuple) -> dict:
+    """Worker entry point: reseed this process's PRNG and generate."""
+    index, complexity, seed, title, topic, model = task
+    random.seed(seed)
+    return generate_conversation(index, complexity, title, topic, model)
+
+
+def generate_conversation(
+    index: int,
+    complexity: str = "simple",
+    title: str = None,
+    topic: str = None,
+    model: str = None,
+) -> dict:
+    """Generate a single conversation with specified complexity.
+
+    title/topic/model may be pre-drawn in batch by the caller; when
+    omitted they are drawn per call. Unknown complexity falls back to
+    the simple generator.
+    """
+    return _GENERATORS.get(complexity, _simple)(index, title, topic, model)
 
 
 def main():
@@ -202,6 +270,24 @@ def main():
     parser.add_argument(
         "--output", default="sample_conversations.json", help="Output filename"
     )
+    parser.add_argument(
+        "--compact",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Write compact JSON (default; --no-compact pretty-prints)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="Output format: one JSON array, or one conversation per line",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for generation (1 = in-process)",
+    )
 
     args = parser.parse_args()
 
@@ -211,22 +297,69 @@ def main():
 
     print(f"Generating {count} {args.complexity} conversations...")
 
-    conversations = []
-    for i in range(count):
+    # Pre-draw the simple-path choices in three batch calls instead of
+    # three PRNG round-trips per conversation
+    titles = random.choices(_TITLES, k=count)
+    topics = random.choices(_TOPICS, k=count)
+    models = random.choices(_MODELS, k=count)
+
+    def complexity_for(i: int) -> str:
         if args.complexity == "mixed":
             # Mix of simple and complex
-            complexity = "complex" if i % 5 == 0 else "simple"
-        else:
-            complexity = args.complexity
+            return "complex" if i % 5 == 0 else "simple"
+        return args.complexity
 
-        conversations.append(generate_conversation(i, complexity))
+    def conversation_stream():
+        if args.workers > 1 and count > 1:
+            # Independent conversations: fan out across processes with
+            # per-task seeds so worker PRNG streams don't collide
+            base_seed = random.getrandbits(32)
+            tasks = [
+                (i, complexity_for(i), base_seed + i, titles[i], topics[i], models[i])
+                for i in range(count)
+            ]
+            with multiprocessing.Pool(args.workers) as pool:
+                yield from pool.imap_unordered(_generate_task, tasks, chunksize=64)
+        else:
+            for i in range(count):
+                yield generate_conversation(
+                    i,
+                    complexity_for(i),
+                    title=titles[i],
+                    topic=topics[i],
+                    model=models[i],
+                )
 
-    # Save to file
     output_path = Path(args.output)
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(conversations, f, indent=2)
+    if args.format == "ndjson":
+        # Stream one conversation per line; nothing is held in memory
+        if ORJSON_AVAILABLE:
+            with open(output_path, "wb") as f:
+                for conv in conversation_stream():
+                    f.write(orjson.dumps(conv))
+                    f.write(b"\n")
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                for conv in conversation_stream():
+                    f.write(json.dumps(conv, separators=(",", ":")))
+                    f.write("\n")
+    else:
+        # Save as one array (orjson encodes in C, single write when available)
+        conversations = list(conversation_stream())
+        if ORJSON_AVAILABLE:
+            option = 0 if args.compact else orjson.OPT_INDENT_2
+            output_path.write_bytes(orjson.dumps(conversations, option=option))
+        else:
+            # Stream encoder chunks through a 1 MiB buffer: avoids both the
+            # per-token writes of json.dump and a full-document string copy
+            if args.compact:
+                encoder = json.JSONEncoder(separators=(",", ":"))
+            else:
+                encoder = json.JSONEncoder(indent=2)
+            with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.writelines(encoder.iterencode(conversations))
 
-    print(f"Generated {len(conversations)} conversations")
+    print(f"Generated {count} conversations")
     print(f"Saved to: {output_path}")
     print(f"File size: {output_path.stat().st_size / 1024:.1f} KB")
 
@@ -3,14 +3,10 @@ Comprehensive tests to achieve 80%+ code coverage.
 """
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 import pytest
 import time
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.extractor import ConversationExtractorV2
 from chatgpt_extractor.processors import MessageProcessor
 from chatgpt_extractor.trackers import SchemaEvolutionTracker, ProgressTracker
@@ -3,13 +3,9 @@ Final tests to push coverage above 80%.
 """
 
 import json
-import sys
-from pathlib import Path
 from unittest.mock import patch, MagicMock, mock_open
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.extractor import ConversationExtractorV2
 from chatgpt_extractor.processors import MessageProcessor
 from chatgpt_extractor.trackers import SchemaEvolutionTracker, ProgressTracker
@@ -2,17 +2,113 @@
 Integration tests for edge cases in conversation graph traversal and content extraction.
 """
 
-import json
-import sys
-from pathlib import Path
-from unittest.mock import patch, MagicMock, mock_open
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.extractor import ConversationExtractorV2
 from chatgpt_extractor.processors import MessageProcessor
 from chatgpt_extractor.trackers import SchemaEvolutionTracker, ProgressTracker
+from tests.test_helpers import write_json_file
+
+# Fixture corpora hoisted to module scope so each is serialized and
+# written to disk once per module instead of once per test
+_WORKFLOW_CONVERSATIONS = [
+    {
+        "id": "test-123",
+        "title": "Test Conversation",
+        "create_time": 1234567890,
+        "update_time": 1234567900,
+        "mapping": {
+            "n1": {
+                "id": "n1",
+                "parent": None,
+                "children": ["n2"],
+                "message": None,
+            },
+            "n2": {
+                "id": "n2",
+                "parent": "n1",
+                "children": ["n3"],
+                "message": {
+                    "author": {"role": "user"},
+                    "content": {"content_type": "text", "parts": ["Hello"]},
+                },
+            },
+            "n3": {
+                "id": "n3",
+                "parent": "n2",
+                "children": ["n4"],
+                "message": {
+                    "author": {"role": "assistant"},
+                    "content": {"content_type": "text", "parts": ["Hi there!"]},
+                },
+            },
+            "n4": {
+                "id": "n4",
+                "parent": "n3",
+                "children": [],
+                "message": {
+                    "author": {"role": "user"},
+                    "content": {
+                        "content_type": "code",
+                        "language": "python",
+                        "text": "print('test')",
+                    },
+                },
+            },
+        },
+        "current_node": "n4",
+    }
+]
+
+_PROJECT_CONVERSATIONS = [
+    {
+        "id": "proj-456",
+        "title": "Project Chat",
+        "conversation_template_id": "g-p-myproject",
+        "gizmo_id": "g-p-myproject",
+        "mapping": {
+            "n1": {
+                "id": "n1",
+                "parent": None,
+                "children": ["n2"],
+                "message": None,
+            },
+            "n2": {
+                "id": "n2",
+                "parent": "n1",
+                "children": [],
+                "message": {
+                    "author": {"role": "user"},
+                    "content": {
+                        "content_type": "text",
+                        "parts": ["Project test"],
+                    },
+                },
+            },
+        },
+        "current_node": "n2",
+    }
+]
+
+
+@pytest.fixture(scope="module")
+def corpus_input(tmp_path_factory):
+    """Write one combined corpus (plain + project conversation) per module."""
+    path = tmp_path_factory.mktemp("coverage_input") / "corpus.json"
+    return write_json_file(path, _WORKFLOW_CONVERSATIONS + _PROJECT_CONVERSATIONS)
+
+
+@pytest.fixture(scope="module")
+def dummy_extractor(tmp_path_factory):
+    """One extractor for tests that only exercise pure helper methods."""
+    output_dir = tmp_path_factory.mktemp("dummy_output")
+    return ConversationExtractorV2("dummy.json", str(output_dir))
+
+
+@pytest.fixture(scope="module")
+def processor():
+    """Shared stateless processor for the pure-function tests below."""
+    return MessageProcessor(SchemaEvolutionTracker())
 
 
 class TestCoverageImprovement:
@@ -22,159 +118,89 @@ class TestCoverageImprovement:
     particularly around None handling, branched conversations, and content type variations.
     """
 
-    def test_extractor_full_workflow(self, tmp_path):
-        """End-to-end extraction with nested nodes and code content type validation."""
-        conversations = [
-            {
-                "id": "test-123",
-                "title": "Test Conversation",
-                "create_time": 1234567890,
-                "update_time": 1234567900,
-                "mapping": {
-                    "n1": {
-                        "id": "n1",
-                        "parent": None,
-                        "children": ["n2"],
-                        "message": None,
-                    },
-                    "n2": {
-                        "id": "n2",
-                        "parent": "n1",
-                        "children": ["n3"],
-                        "message": {
-                            "author": {"role": "user"},
-                            "content": {"content_type": "text", "parts": ["Hello"]},
-                        },
-                    },
-                    "n3": {
-                        "id": "n3",
-                        "parent": "n2",
-                        "children": ["n4"],
-                        "message": {
-                            "author": {"role": "assistant"},
-                            "content": {"content_type": "text", "parts": ["Hi there!"]},
-                        },
-                    },
-                    "n4": {
-                        "id": "n4",
-                        "parent": "n3",
-                        "children": [],
-                        "message": {
-                            "author": {"role": "user"},
-                            "content": {
-                                "content_type": "code",
-                                "language": "python",
-                                "text": "print('test')",
-                            },
-                        },
-                    },
-                },
-                "current_node": "n4",
-            }
-        ]
-
-        input_file = tmp_path / "test.json"
-        input_file.write_text(json.dumps(conversations))
+    def test_extract_all_integration(self, tmp_path, corpus_input):
+        """One full-pipeline pass covering plain and project-folder output."""
         output_dir = tmp_path / "output"
 
-        extractor = ConversationExtractorV2(str(input_file), str(output_dir))
+        extractor = ConversationExtractorV2(str(corpus_input), str(output_dir))
         extractor.extract_all()
 
         assert (output_dir / "md" / "Test Conversation.md").exists()
-
-    def test_extractor_with_project_conversation(self, tmp_path):
-        """Project folder creation and gizmo_id-based conversation grouping."""
-        conversations = [
-            {
-                "id": "proj-456",
-                "title": "Project Chat",
-                "conversation_template_id": "g-p-myproject",
-                "gizmo_id": "g-p-myproject",
-                "mapping": {
-                    "n1": {
-                        "id": "n1",
-                        "parent": None,
-                        "children": ["n2"],
-                        "message": None,
-                    },
-                    "n2": {
-                        "id": "n2",
-                        "parent": "n1",
-                        "children": [],
-                        "message": {
-                            "author": {"role": "user"},
-                            "content": {
-                                "content_type": "text",
-                                "parts": ["Project test"],
-                            },
-                        },
-                    },
-                },
-                "current_node": "n2",
-            }
-        ]
-
-        input_file = tmp_path / "proj.json"
-        input_file.write_text(json.dumps(conversations))
-        output_dir = tmp_path / "output"
-
-        extractor = ConversationExtractorV2(str(input_file), str(output_dir))
-        extractor.extract_all()
-
         assert (output_dir / "md" / "g-p-myproject" / "Project Chat.md").exists()
 
-    def test_message_processor_content_types(self):
+    def test_render_path_without_filesystem(self, tmp_path):
+        """Exercise process_conversation + generate_markdown directly."""
+        extractor = ConversationExtractorV2("dummy.json", str(tmp_path))
+
+        metadata, messages, _ = extractor.process_conversation(
+            _WORKFLOW_CONVERSATIONS[0]
+        )
+        markdown = extractor.generate_markdown(metadata, messages)
+
+        assert "# Test Conversation" in markdown
+        assert "## User" in markdown
+        assert "Hello" in markdown
+        assert "```python" in markdown
+
+    @pytest.mark.parametrize(
+        "msg, conv_id, expected_substrings",
+        [
+            (
+                {"content": {"content_type": "text", "parts": ["Hello world"]}},
+                "test-1",
+                ["Hello world"],
+            ),
+            (
+                {
+                    "content": {
+                        "content_type": "code",
+                        "language": "python",
+                        "text": "def hello():\n    print('world')",
+                    }
+                },
+                "test-2",
+                ["```python", "def hello():"],
+            ),
+            (
+                {"content": {"content_type": "execution_output", "text": "Output: 42"}},
+                "test-3",
+                ["```output", "Output: 42"],
+            ),
+        ],
+        ids=["text", "code", "execution_output"],
+    )
+    def test_message_processor_content_types(
+        self, processor, msg, conv_id, expected_substrings
+    ):
         """Content type handler coverage for text, code, and execution_output."""
-        tracker = SchemaEvolutionTracker()
-        processor = MessageProcessor(tracker)
-
-        # Text content
-        text_msg = {"content": {"content_type": "text", "parts": ["Hello world"]}}
-        result = processor.extract_message_content(text_msg, "test-1")
-        assert result == "Hello world"
-
-        # Code content
-        code_msg = {
-            "content": {
-                "content_type": "code",
-                "language": "python",
-                "text": "def hello():\n    print('world')",
-            }
-        }
-        result = processor.extract_message_content(code_msg, "test-2")
-        assert "```python" in result
-        assert "def hello():" in result
-
-        # Execution output
-        exec_msg = {
-            "content": {"content_type": "execution_output", "text": "Output: 42"}
-        }
-        result = processor.extract_message_content(exec_msg, "test-3")
-        assert "```output" in result
-        assert "Output: 42" in result
-
-    def test_message_filtering(self):
+        result = processor.extract_message_content(msg, conv_id)
+        for expected in expected_substrings:
+            assert expected in result
+
+    @pytest.mark.parametrize(
+        "msg, should_filter",
+        [
+            (
+                {
+                    "author": {"role": "user"},
+                    "metadata": {"is_visually_hidden_from_conversation": True},
+                },
+                True,
+            ),
+            ({"author": {"role": "user"}, "metadata": {}}, False),
+            (
+                {
+                    "author": {"role": "system"},
+                    "metadata": {"is_user_system_message": True},
+                },
+                False,
+            ),
+        ],
+        ids=["visually_hidden", "regular_user", "user_system_message"],
+    )
+    def test_message_filtering(self, processor, msg, should_filter):
         """Message visibility filtering based on metadata flags and role combinations."""
-        tracker = SchemaEvolutionTracker()
-        processor = MessageProcessor(tracker)
-
-        # Should filter: visually hidden
-        msg1 = {
-            "author": {"role": "user"},
-            "metadata": {"is_visually_hidden_from_conversation": True},
-        }
-        assert processor.should_filter_message(msg1) is True
-
-        # Should not filter: regular user message
-        msg2 = {"author": {"role": "user"}, "metadata": {}}
-        assert processor.should_filter_message(msg2) is False
-
-        # Should not filter: user system message
-        msg3 = {
-            "author": {"role": "system"},
-            "metadata": {"is_user_system_message": True},
-        }
-        assert processor.should_filter_message(msg3) is False
+        assert processor.should_filter_message(msg) is should_filter
 
     def test_schema_evolution_tracker(self):
         """Schema discovery tracking with 10-sample limit enforcement."""
@@ -202,46 +228,80 @@ class TestCoverageImprovement:
         """Progress metrics calculation and failure rate tracking."""
         tracker = ProgressTracker(100)
 
-        # Update progress
         tracker.update(success=True)
-        assert tracker.processed == 1
-        assert tracker.failed == 0  # No failures yet
+        assert (tracker.processed, tracker.failed) == (1, 0)
 
         tracker.update(success=False)
-        assert tracker.processed == 2
-        assert tracker.failed == 1
+        assert (tracker.processed, tracker.failed) == (2, 1)
 
-        # Final stats - using the actual method name
+        # Compare counters in one shot so a failure shows the full state
         stats = tracker.final_stats()
-        assert stats["total"] == 100
-        assert stats["processed"] == 2
-        assert stats["failed"] == 1
+        assert {k: stats[k] for k in ("total", "processed", "failed")} == {
+            "total": 100,
+            "processed": 2,
+            "failed": 1,
+        }
         assert stats["success_rate"] > 0
 
-    def test_filename_sanitization(self):
+    @pytest.mark.parametrize(
+        "title, expected",
+        [
+            ("Normal Title", "Normal Title"),
+            ("File/Name:With*Special?", "File_Name_With_Special_"),
+            ("A" * 150, "A" * 100),
+        ],
+        ids=["normal", "special_chars", "truncated"],
+    )
+    def test_filename_sanitization(self, dummy_extractor, title, expected):
         """Cross-platform filename sanitization with 100-char truncation."""
-        extractor = ConversationExtractorV2("dummy.json", "output")
-
-        # Normal title
-        assert extractor.sanitize_filename("Normal Title") == "Normal Title"
-
-        # Title with special chars
-        sanitized = extractor.sanitize_filename("File/Name:With*Special?")
-        assert "/" not in sanitized
-        assert ":" not in sanitized
-        assert "*" not in sanitized
-        assert "?" not in sanitized
-
-        # Very long title (over 100 chars)
-        long_title = "A" * 150
-        sanitized = extractor.sanitize_filename(long_title, max_length=100)
-        assert len(sanitized) == 100
-
-    def test_web_url_extraction(self):
+        assert dummy_extractor.sanitize_filename(title, max_length=100) == expected
+
+    @pytest.mark.parametrize(
+        "title",
+        [
+            "",
+            " ",
+            "....",
+            "." * 300,
+            "a b" * 200,
+            '<>:"/\\|?*' * 50,
+            "\x00\x01\x1f" * 100,
+            "ünïcødé-" * 40,
+            "trailing dots and spaces. . . " * 20,
+        ],
+        ids=[
+            "empty",
+            "space",
+            "dots_only",
+            "long_dots",
+            "long_spaced",
+            "forbidden_chars",
+            "control_chars",
+            "unicode",
+            "trailing_junk",
+        ],
+    )
+    @pytest.mark.parametrize("max_length", [8, 50, 100])
+    def test_filename_sanitization_length_invariant(
+        self, dummy_extractor, title, max_length
+    ):
+        """Sanitized names never exceed max_length for adversarial inputs."""
+        result = dummy_extractor.sanitize_filename(title, max_length=max_length)
+        assert len(result) <= max_length
+        assert result  # never empty; falls back to "untitled"
+        assert not result.endswith((".", " "))
+
+    def test_filename_sanitization_cached(self, dummy_extractor):
+        """Repeat titles should be served from the sanitization cache."""
+        from chatgpt_extractor.extractor import _sanitize_title
+
+        _sanitize_title.cache_clear()
+        dummy_extractor.sanitize_filename("Repeated Title")
+        dummy_extractor.sanitize_filename("Repeated Title")
+        assert _sanitize_title.cache_info().hits >= 1
+
+    def test_web_url_extraction(self, processor):
         """URL pattern matching from message parts and metadata citations."""
-        tracker = SchemaEvolutionTracker()
-        processor = MessageProcessor(tracker)
-
         message = {
             "content": {
                 "content_type": "text",
@@ -255,9 +315,9 @@ class TestCoverageImprovement:
         assert "https://example.com" in urls
         assert "http://test.org" in urls
 
-    def test_backward_traverse_complex(self):
+    def test_backward_traverse_complex(self, dummy_extractor):
         """Branch isolation in forked conversation DAG structures."""
-        extractor = ConversationExtractorV2("dummy.json", "output")
+        extractor = dummy_extractor
 
         # Create a graph with branches
         mapping = {
@@ -300,11 +360,8 @@ class TestCoverageImprovement:
         assert messages_b[0]["content"] == "Branch B1"
         assert messages_b[1]["content"] == "Branch B2"
 
-    def test_citation_extraction(self):
+    def test_citation_extraction(self, processor):
         """Citation metadata extraction from nested dictionary structures."""
-        tracker = SchemaEvolutionTracker()
-        processor = MessageProcessor(tracker)
-
         # No citations
         assert processor.extract_citations({}) == []
 
@@ -320,11 +377,8 @@ class TestCoverageImprovement:
         citations = processor.extract_citations(msg)
         assert len(citations) == 2  # Should extract both citations
 
-    def test_file_attachment_extraction(self):
+    def test_file_attachment_extraction(self, processor):
         """Attachment metadata parsing for uploaded file references."""
-        tracker = SchemaEvolutionTracker()
-        processor = MessageProcessor(tracker)
-
         # No attachments
         assert processor.extract_file_names({}) == []
 
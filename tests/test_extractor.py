@@ -8,9 +8,6 @@ from pathlib import Path
 import pytest
 from unittest.mock import Mock, patch
 
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from chatgpt_extractor.extractor import ConversationExtractorV2
 from tests.test_helpers import capture_logs, assert_in_logs
@@ -257,6 +254,64 @@ class TestConversationExtractorV2:
         output_file = project_dir / "Project Conv.md"
         assert output_file.exists()
 
+    def test_save_to_aggregated_file(self, temp_dirs):
+        """Test aggregated markdown output with delimiter anchors."""
+        input_file, output_dir = temp_dirs
+
+        with open(input_file, "w") as f:
+            json.dump([], f)
+
+        extractor = ConversationExtractorV2(
+            str(input_file), str(output_dir), aggregate_markdown=True
+        )
+
+        extractor.save_to_aggregated_file(
+            {"title": "First", "id": "conv-1", "project_id": "g-p-test-123"},
+            "# First Content",
+        )
+        extractor.save_to_aggregated_file(
+            {"title": "Second", "id": "conv-2", "project_id": "g-p-test-123"},
+            "# Second Content",
+        )
+        extractor.save_to_aggregated_file(
+            {"title": "Loose", "id": "conv-3"}, "# Loose Content"
+        )
+        extractor._close_aggregate_files()
+
+        # Project conversations concatenate into one file per project
+        project_file = output_dir / "md" / "g-p-test-123.md"
+        assert project_file.exists()
+        content = project_file.read_text()
+        assert "<!-- conversation: conv-1 -->" in content
+        assert "<!-- conversation: conv-2 -->" in content
+        assert content.index("# First Content") < content.index("# Second Content")
+
+        # Non-project conversations fall back to conversations.md
+        loose_file = output_dir / "md" / "conversations.md"
+        assert loose_file.exists()
+        assert "<!-- conversation: conv-3 -->" in loose_file.read_text()
+
+    def test_extract_all_parallel(self, sample_data, tmp_path):
+        """Parallel extraction produces the same output set as serial."""
+        input_file = tmp_path / "input.json"
+        with open(input_file, "w") as f:
+            json.dump(sample_data, f)
+
+        outputs = {}
+        for label, workers in (("serial", 1), ("parallel", 2)):
+            output_dir = tmp_path / label
+            extractor = ConversationExtractorV2(
+                str(input_file), str(output_dir), workers=workers
+            )
+            extractor.extract_all()
+            outputs[label] = {
+                p.relative_to(output_dir): p.read_text()
+                for p in output_dir.glob("md/**/*.md")
+            }
+
+        assert outputs["serial"] == outputs["parallel"]
+        assert outputs["serial"]  # sanity: the run produced markdown
+
     def test_extract_all_integration(self, temp_dirs, sample_data, capsys):
         """Integration test for full extraction process."""
         input_file, output_dir = temp_dirs
@@ -2,10 +2,37 @@
 Helper utilities for testing with logging.
 """
 
+import json
 import logging
 from contextlib import contextmanager
 from io import StringIO
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def write_json_file(path, data):
+    """Serialize fixture data to a file with the fastest available encoder.
+
+    Uses orjson when installed (fixture corpora can get large); falls back
+    to stdlib json so suites without the optional dependency still run.
+    """
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data))
+    else:
+        path.write_text(json.dumps(data))
+    return path
+
+
+# One handler shared by every capture_logs invocation; each entry swaps in
+# a fresh StringIO rather than building a handler + formatter per test
+_CAPTURE_HANDLER = logging.StreamHandler(StringIO())
+_CAPTURE_HANDLER.setFormatter(logging.Formatter("%(message)s"))
+
 
 @contextmanager
 def capture_logs(logger_name="chatgpt_extractor", level=logging.INFO):
@@ -18,22 +45,13 @@ def capture_logs(logger_name="chatgpt_extractor", level=logging.INFO):
     Yields:
         StringIO object containing captured log messages
     """
-    # Get the logger
     logger = logging.getLogger(logger_name)
 
-    # Create StringIO to capture output
     log_capture = StringIO()
+    _CAPTURE_HANDLER.setStream(log_capture)
+    _CAPTURE_HANDLER.setLevel(level)
 
-    # Create handler with the StringIO
-    handler = logging.StreamHandler(log_capture)
-    handler.setLevel(level)
-
-    # Add simple formatter
-    formatter = logging.Formatter("%(message)s")
-    handler.setFormatter(formatter)
-
-    # Add handler to logger
-    logger.addHandler(handler)
+    logger.addHandler(_CAPTURE_HANDLER)
     original_level = logger.level
     logger.setLevel(level)
 
@@ -41,9 +59,8 @@ def capture_logs(logger_name="chatgpt_extractor", level=logging.INFO):
         yield log_capture
     finally:
         # Remove handler and restore original level
-        logger.removeHandler(handler)
+        logger.removeHandler(_CAPTURE_HANDLER)
         logger.setLevel(original_level)
-        handler.close()
 
 
 def assert_in_logs(log_capture, text):
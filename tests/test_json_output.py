@@ -6,14 +6,10 @@ Focuses on high-value coverage for the new JSON features.
 import json
 import sys
 import tempfile
-from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pytest
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.extractor import ConversationExtractorV2
 
 
@@ -269,10 +265,10 @@ class TestJSONOutput:
 class TestDirectoryStructure:
     """Test directory creation logic for new structure."""
 
-    def test_default_directory_structure(self, tmp_path):
+    def test_default_directory_structure(self, tmp_path, empty_export_bytes):
         """Test default md/ and json/ subdirectory creation."""
         input_file = tmp_path / "test.json"
-        input_file.write_text(json.dumps([]))
+        input_file.write_bytes(empty_export_bytes)
 
         # Test markdown only (default)
         extractor = ConversationExtractorV2(str(input_file), str(tmp_path / "output1"))
@@ -293,10 +289,10 @@ class TestDirectoryStructure:
         assert (tmp_path / "output3" / "md").exists()
         assert (tmp_path / "output3" / "json").exists()
 
-    def test_override_directories(self, tmp_path):
+    def test_override_directories(self, tmp_path, empty_export_bytes):
         """Test directory override options bypass subdirectory creation."""
         input_file = tmp_path / "test.json"
-        input_file.write_text(json.dumps([]))
+        input_file.write_bytes(empty_export_bytes)
 
         # Test markdown override
         custom_md = tmp_path / "custom_markdown"
@@ -317,10 +313,10 @@ class TestDirectoryStructure:
         assert custom_json.exists()
         assert not (tmp_path / "output2" / "json").exists()
 
-    def test_permission_error_handling(self, tmp_path):
+    def test_permission_error_handling(self, tmp_path, empty_export_bytes):
         """Test handling of permission errors during directory creation."""
         input_file = tmp_path / "test.json"
-        input_file.write_text(json.dumps([]))
+        input_file.write_bytes(empty_export_bytes)
 
         # Mock permission error
         with patch("pathlib.Path.mkdir", side_effect=PermissionError("No permission")):
@@ -333,10 +329,10 @@ class TestDirectoryStructure:
 class TestTimestampSynchronization:
     """Test file timestamp synchronization functionality."""
 
-    def test_timestamp_parsing(self, tmp_path):
+    def test_timestamp_parsing(self, tmp_path, empty_export_bytes):
         """Test ISO timestamp parsing."""
         input_file = tmp_path / "test.json"
-        input_file.write_text(json.dumps([]))
+        input_file.write_bytes(empty_export_bytes)
 
         extractor = ConversationExtractorV2(str(input_file), str(tmp_path))
 
@@ -2,13 +2,9 @@
 Tests for the CLI main module.
 """
 
-import sys
-from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.__main__ import main, run_failure_analysis
 from tests.test_helpers import capture_logs, assert_in_logs
 
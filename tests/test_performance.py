@@ -2,193 +2,222 @@
 Performance tests to ensure extraction speed meets requirements.
 """
 
-import json
+import os
 import time
 import tempfile
 from pathlib import Path
 import pytest
-import sys
-
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from chatgpt_extractor.extractor import ConversationExtractorV2
-
-
-class TestPerformance:
-    """Performance test suite."""
-
-    def generate_conversations(self, count: int) -> list:
-        """Generate sample conversations for performance testing."""
-        conversations = []
-        for i in range(count):
-            conv = {
-                "id": f"perf-test-{i:04d}",
-                "title": f"Performance Test Conversation {i}",
-                "create_time": 1704067200 + i,
-                "update_time": 1704067200 + i + 3600,
-                "mapping": {
-                    "node-1": {
-                        "id": "node-1",
-                        "parent": None,
-                        "children": ["node-2"],
-                        "message": None,
-                    },
-                    "node-2": {
-                        "id": "node-2",
-                        "parent": "node-1",
-                        "children": ["node-3"],
-                        "message": {
-                            "author": {"role": "user"},
-                            "content": {
-                                "content_type": "text",
-                                "parts": [f"Question {i}: How do I learn Python?"],
-                            },
+from tests.test_helpers import write_json_file
+
+
+def _count_md_files(md_dir) -> int:
+    """Count markdown files with one directory read, no Path allocation."""
+    if not md_dir.is_dir():
+        return 0
+    with os.scandir(md_dir) as entries:
+        return sum(1 for e in entries if e.name.endswith(".md"))
+
+
+def generate_conversations(count: int) -> list:
+    """Generate sample conversations for performance testing."""
+    conversations = []
+    for i in range(count):
+        conv = {
+            "id": f"perf-test-{i:04d}",
+            "title": f"Performance Test Conversation {i}",
+            "create_time": 1704067200 + i,
+            "update_time": 1704067200 + i + 3600,
+            "mapping": {
+                "node-1": {
+                    "id": "node-1",
+                    "parent": None,
+                    "children": ["node-2"],
+                    "message": None,
+                },
+                "node-2": {
+                    "id": "node-2",
+                    "parent": "node-1",
+                    "children": ["node-3"],
+                    "message": {
+                        "author": {"role": "user"},
+                        "content": {
+                            "content_type": "text",
+                            "parts": [f"Question {i}: How do I learn Python?"],
                         },
                     },
-                    "node-3": {
-                        "id": "node-3",
-                        "parent": "node-2",
-                        "children": [],
-                        "message": {
-                            "author": {"role": "assistant"},
-                            "content": {
-                                "content_type": "text",
-                                "parts": [
-                                    f"Answer {i}: Here are some tips for learning Python..."
-                                ],
-                            },
+                },
+                "node-3": {
+                    "id": "node-3",
+                    "parent": "node-2",
+                    "children": [],
+                    "message": {
+                        "author": {"role": "assistant"},
+                        "content": {
+                            "content_type": "text",
+                            "parts": [
+                                f"Answer {i}: Here are some tips for learning Python..."
+                            ],
                         },
                     },
                 },
-                "current_node": "node-3",
-                "default_model_slug": "gpt-4",
-            }
-            conversations.append(conv)
-        return conversations
+            },
+            "current_node": "node-3",
+            "default_model_slug": "gpt-4",
+        }
+        conversations.append(conv)
+    return conversations
 
-    @pytest.mark.performance
-    def test_extraction_speed_small(self):
-        """Test extraction speed for small dataset (100 conversations)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "perf_test.json"
-            output_dir = temp_path / "output"
-            output_dir.mkdir()
 
-            # Generate 100 conversations
-            conversations = self.generate_conversations(100)
+@pytest.fixture(scope="module")
+def perf_datasets(tmp_path_factory):
+    """Generate the perf corpus once and write each dataset size once.
 
-            with open(input_file, "w") as f:
-                json.dump(conversations, f)
+    Keeps fixture generation and serialization out of the timed windows
+    below and off the per-test setup cost.
+    """
+    data_dir = tmp_path_factory.mktemp("perf_data")
+    conversations = generate_conversations(1000)
 
-            # Measure extraction time
-            start_time = time.time()
-
-            extractor = ConversationExtractorV2(str(input_file), str(output_dir))
-            extractor.extract_all()
+    datasets = {}
+    for name, count in (("small", 100), ("medium", 500), ("large", 1000)):
+        path = data_dir / f"{name}.json"
+        write_json_file(path, conversations[:count])
+        datasets[name] = (path, count)
+    return datasets
 
-            elapsed_time = time.time() - start_time
-            rate = len(conversations) / elapsed_time
 
-            print(
-                f"\nProcessed {len(conversations)} conversations in {elapsed_time:.2f}s"
-            )
-            print(f"Rate: {rate:.1f} conversations/second")
-
-            # Assert minimum performance (at least 30 conv/s for small datasets)
-            assert (
-                rate >= 30
-            ), f"Performance too slow: {rate:.1f} conv/s (expected >= 30)"
+class TestPerformance:
+    """Performance test suite."""
 
     @pytest.mark.performance
-    @pytest.mark.slow
-    def test_extraction_speed_large(self):
-        """Test extraction speed for larger dataset (1000 conversations)."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "perf_test_large.json"
-            output_dir = temp_path / "output"
-            output_dir.mkdir()
-
-            # Generate 1000 conversations
-            conversations = self.generate_conversations(1000)
-
-            with open(input_file, "w") as f:
-                json.dump(conversations, f)
+    def test_extraction_speed_small(self, perf_datasets, tmp_path):
+        """Test extraction speed for small dataset (100 conversations)."""
+        input_file, count = perf_datasets["small"]
+        extractor = ConversationExtractorV2(str(input_file), str(tmp_path / "output"))
 
-            # Measure extraction time
-            start_time = time.time()
+        # Time only the extraction itself; dataset generation and
+        # extractor construction stay outside the window
+        start_time = time.perf_counter()
+        extractor.extract_all()
+        elapsed_time = time.perf_counter() - start_time
+        rate = count / elapsed_time
 
-            extractor = ConversationExtractorV2(str(input_file), str(output_dir))
-            # Suppress output for performance test
-            import io
-            import sys
+        print(f"\nProcessed {count} conversations in {elapsed_time:.2f}s")
+        print(f"Rate: {rate:.1f} conversations/second")
 
-            old_stdout = sys.stdout
-            sys.stdout = io.StringIO()
+        # Assert minimum performance (at least 30 conv/s for small datasets)
+        assert rate >= 30, f"Performance too slow: {rate:.1f} conv/s (expected >= 30)"
 
-            try:
-                extractor.extract_all()
-            finally:
-                sys.stdout = old_stdout
+    @pytest.mark.performance
+    @pytest.mark.slow
+    def test_extraction_speed_large(self, perf_datasets, tmp_path):
+        """Test extraction speed for larger dataset (1000 conversations)."""
+        input_file, count = perf_datasets["large"]
+        output_dir = tmp_path / "output"
+        extractor = ConversationExtractorV2(str(input_file), str(output_dir))
 
-            elapsed_time = time.time() - start_time
-            rate = len(conversations) / elapsed_time
+        start_time = time.perf_counter()
+        extractor.extract_all()
+        elapsed_time = time.perf_counter() - start_time
+        rate = count / elapsed_time
 
-            print(
-                f"\nProcessed {len(conversations)} conversations in {elapsed_time:.2f}s"
-            )
-            print(f"Rate: {rate:.1f} conversations/second")
+        print(f"\nProcessed {count} conversations in {elapsed_time:.2f}s")
+        print(f"Rate: {rate:.1f} conversations/second")
 
-            # Assert minimum performance (at least 50 conv/s for simple conversations)
-            assert (
-                rate >= 50
-            ), f"Performance too slow: {rate:.1f} conv/s (expected >= 50)"
+        # Assert minimum performance (at least 50 conv/s for simple conversations)
+        assert rate >= 50, f"Performance too slow: {rate:.1f} conv/s (expected >= 50)"
 
-            # Check all files were created in md/ subdirectory
-            md_dir = output_dir / "md"
-            md_files = list(md_dir.glob("*.md")) if md_dir.exists() else []
-            assert len(md_files) == len(conversations)
+        # Check all files were created in md/ subdirectory
+        assert _count_md_files(output_dir / "md") == count
 
-    def test_memory_usage(self):
+    @pytest.mark.performance
+    @pytest.mark.slow
+    def test_extraction_speed_parallel(self, perf_datasets, tmp_path):
+        """Exercise the process-pool path on the large dataset."""
+        input_file, count = perf_datasets["large"]
+        output_dir = tmp_path / "output"
+        extractor = ConversationExtractorV2(str(input_file), str(output_dir), workers=2)
+
+        start_time = time.perf_counter()
+        extractor.extract_all()
+        elapsed_time = time.perf_counter() - start_time
+        rate = count / elapsed_time
+
+        print(f"\nProcessed {count} conversations in {elapsed_time:.2f}s (2 workers)")
+        print(f"Rate: {rate:.1f} conversations/second")
+
+        # Pool startup dominates on corpora this small, so the bound only
+        # guards against pathological slowdowns, not serial-vs-parallel wins
+        assert rate >= 30, f"Performance too slow: {rate:.1f} conv/s (expected >= 30)"
+        assert _count_md_files(output_dir / "md") == count
+
+    def test_memory_usage(self, perf_datasets, tmp_path):
         """Test that memory usage stays reasonable."""
-        import psutil
-        import os
+        import tracemalloc
 
-        process = psutil.Process(os.getpid())
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
+        input_file, count = perf_datasets["medium"]
+        extractor = ConversationExtractorV2(str(input_file), str(tmp_path / "output"))
 
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            input_file = temp_path / "memory_test.json"
-            output_dir = temp_path / "output"
-            output_dir.mkdir()
+        # Track Python allocations only; RSS sampling picks up interpreter
+        # noise and allocator fragmentation, forcing a much looser bound
+        tracemalloc.start()
+        try:
+            extractor.extract_all()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
 
-            # Generate a moderate dataset
-            conversations = self.generate_conversations(500)
+        peak_mb = peak / 1024 / 1024
+        print(f"\nPeak Python allocation: {peak_mb:.1f} MB")
 
-            with open(input_file, "w") as f:
-                json.dump(conversations, f)
+        # 500 small conversations should parse and render well under this
+        assert peak_mb < 100, f"Memory usage too high: {peak_mb:.1f} MB"
 
-            extractor = ConversationExtractorV2(str(input_file), str(output_dir))
+    @pytest.mark.performance
+    def test_backward_traverse_speed(self):
+        """Guard traversal throughput on a deep 10k-node chain.
 
-            # Suppress output
-            import io
+        Catches regressions in the backward_traverse hot loop (e.g. a
+        reverted local-binding or scratch-set optimization) without
+        needing an external benchmarking plugin.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extractor = ConversationExtractorV2("dummy.json", temp_dir)
+
+        depth = 10_000
+        mapping = {"node-0": {"id": "node-0", "parent": None, "children": ["node-1"]}}
+        for i in range(1, depth):
+            mapping[f"node-{i}"] = {
+                "id": f"node-{i}",
+                "parent": f"node-{i - 1}",
+                "children": [f"node-{i + 1}"] if i + 1 < depth else [],
+                "message": {
+                    "author": {"role": "user" if i % 2 else "assistant"},
+                    "content": {"content_type": "text", "parts": [f"msg {i}"]},
+                },
+            }
 
-            old_stdout = sys.stdout
-            sys.stdout = io.StringIO()
+        start_time = time.perf_counter()
+        messages = extractor.backward_traverse(mapping, f"node-{depth - 1}", "perf")
+        elapsed_time = time.perf_counter() - start_time
 
-            try:
-                extractor.extract_all()
-            finally:
-                sys.stdout = old_stdout
+        assert len(messages) == depth - 1
+        # Generous bound: the walk runs in well under 100ms on commodity
+        # hardware; a full second signals an algorithmic regression
+        assert elapsed_time < 1.0, f"Traversal too slow: {elapsed_time:.3f}s"
 
-            final_memory = process.memory_info().rss / 1024 / 1024  # MB
-            memory_increase = final_memory - initial_memory
+    @pytest.mark.performance
+    def test_sanitize_filename_repeat_speed(self):
+        """Guard the memoized sanitization path for repeated titles."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            extractor = ConversationExtractorV2("dummy.json", temp_dir)
 
-            print(f"\nMemory usage increased by {memory_increase:.1f} MB")
+        start_time = time.perf_counter()
+        for _ in range(50_000):
+            extractor.sanitize_filename("New chat")
+        elapsed_time = time.perf_counter() - start_time
 
-            # Assert memory usage is reasonable (less than 500MB increase for 500 conversations)
-            assert (
-                memory_increase < 500
-            ), f"Memory usage too high: {memory_increase:.1f} MB"
+        # Cached lookups should make repeat titles effectively free
+        assert elapsed_time < 1.0, f"Sanitization too slow: {elapsed_time:.3f}s"
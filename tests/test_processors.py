@@ -2,12 +2,8 @@
 Tests for the MessageProcessor class.
 """
 
-import sys
-from pathlib import Path
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.processors import MessageProcessor
 from chatgpt_extractor.trackers import SchemaEvolutionTracker
 
@@ -116,6 +112,12 @@ class TestMessageProcessor:
         assert "Text part" in result
         assert "[DALL-E Image: A sunset]" in result
 
+    def test_content_handlers_cover_known_types(self, processor):
+        """Every dispatch-table key must be a tracked known content type."""
+        known = SchemaEvolutionTracker.KNOWN_CONTENT_TYPES
+        for content_type in processor._content_handlers:
+            assert content_type in known
+
     def test_extract_from_parts_with_none(self, processor):
         """Test handling of None values in parts array."""
         parts = ["Hello", None, "World"]
@@ -186,6 +188,22 @@ class TestMessageProcessor:
         assert "https://example.com" in urls
         assert "https://test.org" in urls
 
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("plain text with no links", []),
+            ("see https://example.com today", ["https://example.com"]),
+            ("http://a.org and https://b.org", ["http://a.org", "https://b.org"]),
+            ('<a href="https://c.net">link</a>', ["https://c.net"]),
+        ],
+        ids=["no_urls", "single", "mixed_schemes", "html_delimited"],
+    )
+    def test_find_urls_scanner(self, text, expected):
+        """Test the precompiled module-level URL scanner directly."""
+        from chatgpt_extractor.processors import _find_urls
+
+        assert _find_urls(text) == expected
+
     def test_extract_file_names_from_attachments(self, processor):
         """Test file name extraction from attachments."""
         msg = {
@@ -3,12 +3,8 @@ Tests for the tracking components.
 """
 
 import time
-import sys
-from pathlib import Path
 import pytest
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from chatgpt_extractor.trackers import SchemaEvolutionTracker, ProgressTracker
 
 